@@ -3,7 +3,9 @@
 Debug test for bestmove 0000 issue
 """
 
+import queue
 import subprocess
+import threading
 import time
 
 def debug_bestmove_issue():
@@ -21,113 +23,94 @@ def debug_bestmove_issue():
     
     engine_path = "../dist/Cece_v1.0.exe"
     
-    for position, description in test_cases:
-        print(f"\n🎯 Testing: {description}")
-        print(f"Position: {position}")
+    def send(cmd):
+        print(f"SEND: {cmd}")
+        engine.stdin.write(f"{cmd}\n")
+        engine.stdin.flush()
+    
+    def read_until(pred, timeout=None):
+        """Read and echo engine lines until pred matches or the timeout expires."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                break  # Engine exited
+            all_output.append(line)
+            print(f"RECV: {line}")
+            if pred(line):
+                break
+    
+    # One engine process for all test cases - handshake once, then reuse it
+    engine = subprocess.Popen(
+        engine_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    
+    # Reader thread pushes engine output onto a queue so waits never poll
+    lines = queue.Queue()
+    
+    def pump():
+        for line in iter(engine.stdout.readline, ''):
+            lines.put(line.strip())
+        lines.put(None)
+    
+    threading.Thread(target=pump, daemon=True).start()
+    
+    try:
+        all_output = []
+        send("uci")
+        read_until(lambda line: line == "uciok")
+        send("isready")
+        read_until(lambda line: line == "readyok")
         
-        try:
-            engine = subprocess.Popen(
-                engine_path,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0
-            )
-            
-            # Send commands with careful timing
-            commands = [
-                "uci",
-                "isready", 
-                f"position {'startpos' if position == 'startpos' else 'fen ' + position}",
-                "go depth 3"
-            ]
+        for position, description in test_cases:
+            print(f"\n🎯 Testing: {description}")
+            print(f"Position: {position}")
             
-            all_output = []
-            
-            for cmd in commands:
-                print(f"SEND: {cmd}")
-                if engine.stdin:
-                    engine.stdin.write(f"{cmd}\n")
-                    engine.stdin.flush()
+            try:
+                all_output = []
+                
+                send("ucinewgame")
+                send(f"position {'startpos' if position == 'startpos' else 'fen ' + position}")
+                send("isready")
+                read_until(lambda line: line == "readyok")
+                
+                # Wait for bestmove with timeout
+                send("go depth 3")
+                read_until(lambda line: line.startswith("bestmove"), 10)  # 10 second timeout
+                
+                # Analysis
+                print("\n📊 Analysis:")
+                bestmoves = [line for line in all_output if line.startswith("bestmove")]
+                if bestmoves:
+                    print(f"✅ Found bestmove: {bestmoves[-1]}")
+                else:
+                    print("❌ No bestmove found")
+                    print("Last few lines of output:")
+                    for line in all_output[-5:]:
+                        print(f"  {line}")
                 
-                # Read response for this command
-                if cmd == "uci":
-                    # Wait for uciok
-                    while True:
-                        if engine.stdout:
-                            line = engine.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                all_output.append(line)
-                                print(f"RECV: {line}")
-                                if line == "uciok":
-                                    break
-                elif cmd == "isready":
-                    # Wait for readyok
-                    while True:
-                        if engine.stdout:
-                            line = engine.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                all_output.append(line)
-                                print(f"RECV: {line}")
-                                if line == "readyok":
-                                    break
-                elif cmd.startswith("position"):
-                    # Brief pause for position setting
-                    time.sleep(0.2)
-                    # Read any immediate response
-                    while True:
-                        if engine.stdout and engine.poll() is None:
-                            try:
-                                line = engine.stdout.readline()
-                                if line:
-                                    line = line.strip()
-                                    all_output.append(line)
-                                    print(f"RECV: {line}")
-                                else:
-                                    break
-                            except:
-                                break
-                        else:
-                            break
-                elif cmd.startswith("go"):
-                    # Wait for bestmove with timeout
-                    start_time = time.time()
-                    while time.time() - start_time < 10:  # 10 second timeout
-                        if engine.stdout:
-                            line = engine.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                all_output.append(line)
-                                print(f"RECV: {line}")
-                                if line.startswith("bestmove"):
-                                    break
-                        else:
-                            time.sleep(0.1)
+            except Exception as e:
+                print(f"❌ Error: {e}")
             
-            # Clean up
-            if engine.stdin:
-                engine.stdin.write("quit\n")
-                engine.stdin.flush()
+            print("-" * 40)
+    finally:
+        # Clean up
+        try:
+            send("quit")
             engine.wait(timeout=3)
-            
-            # Analysis
-            print("\n📊 Analysis:")
-            bestmoves = [line for line in all_output if line.startswith("bestmove")]
-            if bestmoves:
-                print(f"✅ Found bestmove: {bestmoves[-1]}")
-            else:
-                print("❌ No bestmove found")
-                print("Last few lines of output:")
-                for line in all_output[-5:]:
-                    print(f"  {line}")
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        print("-" * 40)
+        except (OSError, subprocess.TimeoutExpired):
+            engine.kill()
 
 if __name__ == "__main__":
     debug_bestmove_issue()
@@ -3,7 +3,9 @@
 Simple step-by-step UCI test
 """
 
+import queue
 import subprocess
+import threading
 import time
 
 def step_by_step_test():
@@ -19,37 +21,55 @@ def step_by_step_test():
             engine_path,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            bufsize=0
+            bufsize=1
         )
+        assert engine.stdin is not None and engine.stdout is not None  # Both are PIPEs
+        
+        # Reader thread pushes engine output onto a queue so waits can time out
+        lines = queue.Queue()
+        
+        def pump():
+            for line in iter(engine.stdout.readline, ''):
+                lines.put(line.strip())
+            lines.put(None)
+        
+        threading.Thread(target=pump, daemon=True).start()
+        
+        def send(command):
+            """Send a command without waiting for any reply."""
+            print(f"\n📤 SEND: {command}")
+            engine.stdin.write(f"{command}\n")
+            engine.stdin.flush()
         
         def send_and_wait(command, wait_for=None, timeout=5):
             """Send command and wait for specific response."""
-            print(f"\n📤 SEND: {command}")
-            if engine.stdin:
-                engine.stdin.write(f"{command}\n")
-                engine.stdin.flush()
+            send(command)
             
-            start_time = time.time()
+            deadline = time.monotonic() + timeout
             responses = []
             
-            while time.time() - start_time < timeout:
-                if engine.stdout:
-                    line = engine.stdout.readline()
-                    if line:
-                        line = line.strip()
-                        responses.append(line)
-                        print(f"📥 RECV: {line}")
-                        
-                        if wait_for and line == wait_for:
-                            print(f"✅ Got expected response: {wait_for}")
-                            return True, responses
-                        elif line.startswith("bestmove"):
-                            print(f"✅ Got bestmove: {line}")
-                            return True, responses
-                else:
-                    time.sleep(0.1)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    line = lines.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if line is None:
+                    print("❌ Engine closed its output")
+                    return False, responses
+                responses.append(line)
+                print(f"📥 RECV: {line}")
+                
+                if wait_for and line == wait_for:
+                    print(f"✅ Got expected response: {wait_for}")
+                    return True, responses
+                elif line.startswith("bestmove"):
+                    print(f"✅ Got bestmove: {line}")
+                    return True, responses
             
             print(f"⏰ Timeout waiting for response")
             return False, responses
@@ -68,8 +88,12 @@ def step_by_step_test():
             return False
         
         print("\n=== Position Setting ===")
-        success, _ = send_and_wait("position startpos", None, 2)
-        print("Position command sent, no specific response expected")
+        # position has no reply of its own; isready confirms it was processed
+        # instead of sitting out a fixed timeout
+        send("position startpos")
+        success, _ = send_and_wait("isready", "readyok", 2)
+        if not success:
+            print("❌ Position not acknowledged")
         
         print("\n=== Search Test (depth 3) ===")
         success, _ = send_and_wait("go depth 3", None, 10)
@@ -77,9 +101,7 @@ def step_by_step_test():
             print("❌ Search failed - no bestmove received")
         
         print("\n=== Cleanup ===")
-        if engine.stdin:
-            engine.stdin.write("quit\n")
-            engine.stdin.flush()
+        send("quit")
         
         engine.wait(timeout=3)
         print("✅ Engine terminated")
@@ -2,12 +2,19 @@
 Test the consolidated evaluation.py to verify all components work correctly.
 """
 
+import functools
+
 import chess
 from evaluation import Evaluation
 
+@functools.lru_cache(maxsize=None)
+def _evaluator() -> Evaluation:
+    """One Evaluation shared by every test; its tables are built once."""
+    return Evaluation()
+
 def test_basic_evaluation():
     """Test basic evaluation functionality."""
-    evaluator = Evaluation()
+    evaluator = _evaluator()
     
     # Test starting position
     board = chess.Board()
@@ -28,7 +35,7 @@ def test_basic_evaluation():
 
 def test_enhanced_pst():
     """Test that enhanced PST properly penalizes bad moves."""
-    evaluator = Evaluation()
+    evaluator = _evaluator()
     
     # Test position with queen on h8 (manually set bad position)
     board = chess.Board("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNQ w Qkq - 0 1")  # Queen on h1
@@ -53,7 +60,7 @@ def test_enhanced_pst():
 
 def test_see_evaluation():
     """Test Static Exchange Evaluation."""
-    evaluator = Evaluation()
+    evaluator = _evaluator()
     
     # Test position: pawn takes pawn (should be positive)
     board = chess.Board("rnbqkbnr/ppp1pppp/8/3p4/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 0 2")
@@ -69,7 +76,7 @@ def test_see_evaluation():
 
 def test_threat_evaluation():
     """Test threat evaluation system."""
-    evaluator = Evaluation()
+    evaluator = _evaluator()
     
     # Position with knight attacking multiple pieces
     board = chess.Board("rnbqkb1r/pppp1ppp/5n2/4p3/2B1P3/8/PPPP1PPP/RNBQK1NR w KQkq - 2 3")
@@ -84,7 +91,7 @@ def test_threat_evaluation():
 
 def test_castling_evaluation():
     """Test castling evaluation."""
-    evaluator = Evaluation()
+    evaluator = _evaluator()
     
     # Opening position - should encourage castling
     board = chess.Board()
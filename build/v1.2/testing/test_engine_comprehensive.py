@@ -386,7 +386,8 @@ class EngineTestSuite:
                 
                 if bestmove_lines:
                     bestmove = bestmove_lines[-1]
-                    move_part = bestmove.split()[1] if len(bestmove.split()) > 1 else "none"
+                    parts = bestmove.split()
+                    move_part = parts[1] if len(parts) > 1 else "none"
                     
                     if move_part != "none" and len(move_part) >= 4:
                         return True, f"Found move: {move_part}", {
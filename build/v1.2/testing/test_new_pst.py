@@ -18,48 +18,27 @@ def test_evaluation_with_new_pst():
     
     eval_engine = Evaluation()
     
-    # Test starting position
-    board = chess.Board()
-    detailed_eval = eval_engine.evaluate_detailed(board)
-    
-    print("📋 Starting Position Evaluation:")
-    print(f"Total Score: {detailed_eval['total_score']}")
-    print(f"Material: {detailed_eval['material']}")
-    print(f"Positional: {detailed_eval['positional']}")
-    print(f"Tactical: {detailed_eval['tactical']}")
-    print(f"King Safety: {detailed_eval['king_safety']}")
-    print(f"Piece Activity: {detailed_eval['piece_activity']}")
-    print()
-    
-    # Test a middle game position
-    print("📋 Middle Game Position:")
-    # Sicilian Dragon position
-    board.set_fen("rnbqkb1r/pp2pppp/3p1n2/8/3PP3/2N2N2/PPP2PPP/R1BQKB1R b KQkq - 0 4")
-    detailed_eval = eval_engine.evaluate_detailed(board)
-    
-    print(f"FEN: {board.fen()}")
-    print(f"Total Score: {detailed_eval['total_score']}")
-    print(f"Material: {detailed_eval['material']}")
-    print(f"Positional: {detailed_eval['positional']}")
-    print(f"Tactical: {detailed_eval['tactical']}")
-    print(f"King Safety: {detailed_eval['king_safety']}")
-    print(f"Piece Activity: {detailed_eval['piece_activity']}")
-    print()
-    
-    # Test a puzzle position
-    print("📋 Tactical Puzzle Position:")
-    # Use one of the puzzle positions from our tests
-    board.set_fen("4rk2/p1q5/1p3Q1b/8/1p5N/2P1p3/P3P3/2K5 b - - 0 43")
-    detailed_eval = eval_engine.evaluate_detailed(board)
-    
-    print(f"FEN: {board.fen()}")
-    print(f"Total Score: {detailed_eval['total_score']}")
-    print(f"Material: {detailed_eval['material']}")
-    print(f"Positional: {detailed_eval['positional']}")
-    print(f"Tactical: {detailed_eval['tactical']}")
-    print(f"King Safety: {detailed_eval['king_safety']}")
-    print(f"Piece Activity: {detailed_eval['piece_activity']}")
-    print()
+    # Evaluate every test position in one pass, then report
+    positions = [
+        ("Starting Position Evaluation", chess.STARTING_FEN),
+        # Sicilian Dragon position
+        ("Middle Game Position", "rnbqkb1r/pp2pppp/3p1n2/8/3PP3/2N2N2/PPP2PPP/R1BQKB1R b KQkq - 0 4"),
+        # Use one of the puzzle positions from our tests
+        ("Tactical Puzzle Position", "4rk2/p1q5/1p3Q1b/8/1p5N/2P1p3/P3P3/2K5 b - - 0 43"),
+    ]
+    breakdowns = [eval_engine.evaluate_detailed(chess.Board(fen)) for _, fen in positions]
+    
+    for (title, fen), detailed_eval in zip(positions, breakdowns):
+        print(f"📋 {title}:")
+        if fen != chess.STARTING_FEN:
+            print(f"FEN: {fen}")
+        print(f"Total Score: {detailed_eval['total_score']}")
+        print(f"Material: {detailed_eval['material']}")
+        print(f"Positional: {detailed_eval['positional']}")
+        print(f"Tactical: {detailed_eval['tactical']}")
+        print(f"King Safety: {detailed_eval['king_safety']}")
+        print(f"Piece Activity: {detailed_eval['piece_activity']}")
+        print()
     
     # Test individual piece placement
     print("📋 Individual Piece Square Table Tests:")
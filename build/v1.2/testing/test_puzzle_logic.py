@@ -3,9 +3,22 @@
 Test the corrected puzzle sequence logic with a known example.
 """
 
+import functools
+
 import chess
 from enhanced_puzzle_tester import Puzzle
 
+# Moves are immutable, so parsed ones can be shared between re-runs
+_move_from_uci = functools.lru_cache(maxsize=4096)(chess.Move.from_uci)
+
+@functools.lru_cache(maxsize=1024)
+def _parsed_board(fen: str) -> chess.Board:
+    return chess.Board(fen)
+
+def _board_from_fen(fen: str) -> chess.Board:
+    """Fresh board for fen; the FEN is parsed once and copied after that."""
+    return _parsed_board(fen).copy()
+
 def test_puzzle_logic():
     """Test puzzle sequence interpretation with a known example."""
     
@@ -32,32 +45,25 @@ def test_puzzle_logic():
     print()
     
     # Set up the board
-    board = chess.Board(puzzle.fen)
+    board = _board_from_fen(puzzle.fen)
     print(f"Initial position: {'White' if board.turn else 'Black'} to move")
     print(f"FEN: {puzzle.fen}")
     print()
     
-    # Analyze the sequence
-    engine_moves = []
-    opponent_moves = []
+    # Replay the sequence once, keeping the position before every move;
+    # moves alternate engine, opponent, engine, ...
+    roles = ("Engine Move", "Opponent Move")
+    fens = []
     
-    for move_num, move in enumerate(puzzle.moves, 1):
-        is_engine_move = (move_num % 2 == 1)  # Odd moves are engine moves
-        
-        if is_engine_move:
-            engine_moves.append((move_num, move, board.fen()))
-            print(f"Engine Move {(move_num + 1) // 2}: {move}")
-            print(f"  Position: {board.fen()}")
-            print(f"  Side to move: {'White' if board.turn else 'Black'}")
-        else:
-            opponent_moves.append((move_num, move, board.fen()))
-            print(f"Opponent Move {move_num // 2}: {move}")
-            print(f"  Position: {board.fen()}")
-            print(f"  Side to move: {'White' if board.turn else 'Black'}")
+    for ply, move in enumerate(puzzle.moves):
+        fens.append(board.fen())
+        print(f"{roles[ply % 2]} {ply // 2 + 1}: {move}")
+        print(f"  Position: {fens[-1]}")
+        print(f"  Side to move: {'White' if board.turn else 'Black'}")
         
         # Apply the move
         try:
-            chess_move = chess.Move.from_uci(move)
+            chess_move = _move_from_uci(move)
             board.push(chess_move)
             print(f"  After {move}: {board.fen()}")
         except:
@@ -65,6 +71,10 @@ def test_puzzle_logic():
             break
         print()
     
+    # Odd-numbered moves are engine moves, even-numbered ones opponent responses
+    engine_moves = list(zip(range(1, len(fens) + 1, 2), puzzle.moves[::2], fens[::2]))
+    opponent_moves = list(zip(range(2, len(fens) + 1, 2), puzzle.moves[1::2], fens[1::2]))
+    
     print("📊 Summary:")
     print(f"Total moves in sequence: {len(puzzle.moves)}")
     print(f"Engine moves to test: {len(engine_moves)}")
@@ -16,74 +16,129 @@ Then type UCI commands like:
   quit
 """
 
+import queue
 import subprocess
 import sys
+import threading
 import time
-import os
+from contextlib import contextmanager
+from pathlib import Path
 
+# uci_interface.py lives in the parent of this testing directory
+_UCI_PATH = Path(__file__).resolve().parent.parent / "uci_interface.py"
 
-def test_uci_basic():
-    """Test basic UCI communication."""
-    print("=== UCI Interface Test ===")
-    print("Starting UCI engine...")
+# Lines that end an engine response to uci / isready / go
+_TERMINATORS = ("uciok", "readyok", "bestmove ")
+_REPL_TERMS = frozenset(("uciok", "readyok"))
+
+
+def _reader(stream, lines):
+    """Forward lines from a text or binary engine pipe as text; None marks EOF.
     
+    Only the line ending is removed, so indented engine output keeps its layout.
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        if isinstance(line, bytes):
+            line = line.decode("ascii", "replace")
+        lines.put(line.rstrip("\r\n"))
+    lines.put(None)
+
+
+@contextmanager
+def uci_engine():
+    """Start the UCI engine once and yield a (send_command, read_output) pair.
+    
+    The engine is asked to quit (and killed if it will not) on exit, so
+    several tests can share one process instead of cold-starting each.
+    """
     # Start the UCI process (path relative to parent directory)
-    uci_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uci_interface.py")
+    uci_path = str(_UCI_PATH)
     process = subprocess.Popen(
         [sys.executable, uci_path],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1
+        stderr=subprocess.STDOUT
     )
     
+    # Reader thread pushes engine output onto a queue so reads wait on a
+    # deadline instead of sleeping (select() does not work on Windows pipes)
+    lines = queue.Queue()
+    threading.Thread(target=_reader, args=(process.stdout, lines), daemon=True).start()
+    
+    # Commands are ASCII, so they are batched as bytes and written in one go
+    pending = bytearray()
+    
     def send_command(cmd):
-        """Send a command and get response."""
+        """Queue a command for the engine."""
         print(f">>> {cmd}")
-        if process.stdin:
-            process.stdin.write(cmd + "\n")
+        pending.extend(cmd.encode("ascii"))
+        pending.extend(b"\n")
+    
+    def flush_commands():
+        """Write all queued commands with a single write and flush."""
+        if process.stdin and pending and process.poll() is None:
+            process.stdin.write(bytes(pending))
             process.stdin.flush()
-        time.sleep(0.1)  # Give time for response
+        pending.clear()
         
-    def read_output():
-        """Read available output."""
+    def read_output(timeout=10):
+        """Flush queued commands, then read until a terminator or the timeout."""
+        flush_commands()
         output = []
-        try:
-            while True:
-                if not process.stdout:
-                    break
-                line = process.stdout.readline()
-                if not line:
-                    break
-                line = line.strip()
-                if line:
-                    print(f"<<< {line}")
-                    output.append(line)
-                if line == "uciok" or line == "readyok" or line.startswith("bestmove"):
-                    break
-        except:
-            pass
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                lines.put(None)  # Keep the EOF marker so later reads return at once
+                break  # Engine exited
+            line = line.strip()
+            if line:
+                print(f"<<< {line}")
+                output.append(line)
+            if line.startswith(_TERMINATORS):
+                break
         return output
     
     try:
-        # Test UCI identification
-        send_command("uci")
-        response = read_output()
-        
-        # Test ready state
-        send_command("isready")
-        response = read_output()
-        
-        # Test position setting
-        send_command("position startpos moves e2e4 e7e5")
-        
-        # Test search
-        send_command("go depth 4")
-        response = read_output()
-        
-        # Quit
-        send_command("quit")
+        yield send_command, read_output
+    finally:
+        try:
+            send_command("quit")
+            flush_commands()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+
+def test_uci_basic():
+    """Test basic UCI communication."""
+    print("=== UCI Interface Test ===")
+    print("Starting UCI engine...")
+    
+    try:
+        with uci_engine() as (send_command, read_output):
+            # Test UCI identification
+            send_command("uci")
+            response = read_output()
+            
+            # Test ready state
+            send_command("isready")
+            response = read_output()
+            
+            # Test position setting and search (sent as one batch)
+            send_command("position startpos moves e2e4 e7e5")
+            send_command("go depth 4")
+            response = read_output()
         
         print("\n=== UCI Test Complete ===")
         print("✓ Engine responds to UCI commands")
@@ -91,9 +146,6 @@ def test_uci_basic():
         
     except Exception as e:
         print(f"Error during UCI test: {e}")
-    finally:
-        process.terminate()
-        process.wait()
 
 
 def interactive_uci():
@@ -103,12 +155,12 @@ def interactive_uci():
     print()
     
     # Start the UCI process (path relative to parent directory)
-    uci_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uci_interface.py")
+    uci_path = str(_UCI_PATH)
     process = subprocess.Popen(
         [sys.executable, uci_path],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True,
         bufsize=1
     )
@@ -125,9 +177,49 @@ def interactive_uci():
         print("  quit                    - Exit engine")
         print()
     
+    # Reader thread streams engine output (stderr is merged in) onto a queue
+    lines = queue.Queue()
+    threading.Thread(target=_reader, args=(process.stdout, lines), daemon=True).start()
+    
+    def drain(timeout=None):
+        """Print queued engine output.
+        
+        Without a timeout only what has already arrived is printed; with one,
+        lines are printed as they stream in until a terminator or the deadline.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if deadline is None:
+                    line = lines.get_nowait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    line = lines.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if line is None:
+                lines.put(None)  # Keep the EOF marker so later reads return at once
+                return  # Engine exited
+            if line:
+                print(line)
+            stripped = line.strip()
+            if stripped in _REPL_TERMS or stripped.startswith("bestmove"):
+                return
+    
     try:
         while True:
-            command = input("UCI> ").strip()
+            drain()
+            if process.poll() is not None:
+                print(f"Engine exited with code {process.returncode}")
+                break
+            sys.stdout.write("UCI> ")
+            sys.stdout.flush()
+            command = sys.stdin.readline()
+            if not command:
+                break  # EOF on stdin (e.g. piped commands ran out)
+            command = command.strip()
             
             if command == "exit":
                 break
@@ -142,22 +234,10 @@ def interactive_uci():
                 process.stdin.write(command + "\n")
                 process.stdin.flush()
             
-            # Read response (with timeout)
-            time.sleep(0.1)
-            try:
-                while True:
-                    if not process.stdout:
-                        break
-                    line = process.stdout.readline()
-                    if not line:
-                        break
-                    line = line.strip()
-                    if line:
-                        print(line)
-                    if line in ["uciok", "readyok"] or line.startswith("bestmove"):
-                        break
-            except:
-                pass
+            # Stream the response of commands that end with a terminator
+            name = command.split()[0]
+            if name in ("uci", "isready") or (name == "go" and "infinite" not in command):
+                drain(timeout=30)
             
             if command == "quit":
                 break
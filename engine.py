@@ -18,13 +18,26 @@ Attribution: Built on python-chess library by Niklas Fiekas
 
 import chess
 import chess.engine
+import chess.polyglot
 import time
-from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from dataclasses import dataclass
 from evaluation import Evaluation
 from data_collector import ThoughtCollector, IdeaCollector
 
 
+@lru_cache(maxsize=None)
+def _parse_uci_move(move_str: str) -> chess.Move:
+    """Parse a UCI move string; there are only a few thousand, so each is parsed once."""
+    return chess.Move.from_uci(move_str)
+
+
+def _never_stop() -> bool:
+    """Default stop check for searches that only obey the clock."""
+    return False
+
+
 @dataclass
 class SearchInfo:
     """Container for search information and statistics."""
@@ -65,6 +78,14 @@ class ChessEngine:
         
         # Engine state
         self.board = chess.Board()
+        self._last_position: Optional[Tuple[Optional[str], chess.Board, List[str], List[chess.Move]]] = None
+        
+        # Direct-mapped evaluation cache keyed by Zobrist hash (64K entries).
+        # Entries carry the generation they were stored in; only current ones hit.
+        self.eval_cache_bits = 16
+        self.eval_cache_mask = (1 << self.eval_cache_bits) - 1
+        self.eval_cache_gen = 0
+        self.eval_cache: List[Optional[Tuple[int, int, int, Dict[str, Any]]]] = [None] * (1 << self.eval_cache_bits)
         
         # Engine metadata - Updated to v1.3
         self.info = {
@@ -96,34 +117,68 @@ class ChessEngine:
         # Performance tracking
         self.search_stats = SearchInfo(0, 0, 0, [], 0, 0, 0, 0)
         
+        # Polled alongside the clock so a UCI 'stop' can end the search early
+        self.should_stop: Callable[[], bool] = _never_stop
+        
+        # Where position and search progress lines go; the UCI front end swaps in
+        # its own locked writer so they cannot splice into protocol replies
+        self.output: Callable[[str], None] = print
+        
         print(f"Initialized {self.info['name']} v{self.info['version']}")
         print(f"Author: {self.info['author']}")
         print(f"Attribution: {self.info['attribution']}")
     
     # === Core Engine Methods ===
     
+    def reset(self):
+        """
+        Prepare for a new game without rebuilding the engine.
+        
+        Board, collected data and per-game evaluator state are cleared; the
+        evaluator's tables and tuned weights and the evaluation cache, whose
+        entries depend only on the position, are kept.
+        """
+        self.board = chess.Board()
+        self.thought_collector.clear()
+        self.idea_collector.clear()
+        self.evaluator.piece_move_count.clear()
+        self.evaluator.developed_pieces.clear()
+        self.search_stats = SearchInfo(0, 0, 0, [], 0, 0, 0, 0)
+        self.should_stop = _never_stop
+    
     def set_position(self, fen: Optional[str] = None, moves: Optional[List[str]] = None):
-        """Set board position from FEN and/or move sequence."""
-        if fen:
-            self.board = chess.Board(fen)
+        """
+        Set board position from FEN and/or move sequence.
+        
+        GUIs resend the whole game before every search; when the request only
+        extends the position set last time, just the new moves are played.
+        """
+        moves = moves or []
+        last = self._last_position
+        if (last is not None and last[0] == fen and last[1] is self.board
+                and moves[:len(last[2])] == last[2]
+                and self.board.move_stack == last[3]):
+            new_moves = moves[len(last[2]):]
         else:
-            self.board = chess.Board()
+            self.board = chess.Board(fen) if fen else chess.Board()
+            new_moves = moves
             
-        if moves:
-            for move_str in moves:
+        for move_str in new_moves:
+            try:
+                move = _parse_uci_move(move_str)
+                if self.board.is_legal(move):
+                    self.board.push(move)
+            except ValueError:
+                # Try parsing as SAN
                 try:
-                    move = chess.Move.from_uci(move_str)
-                    if move in self.board.legal_moves:
-                        self.board.push(move)
+                    move = self.board.parse_san(move_str)
+                    self.board.push(move)
                 except ValueError:
-                    # Try parsing as SAN
-                    try:
-                        move = self.board.parse_san(move_str)
-                        self.board.push(move)
-                    except ValueError:
-                        raise ValueError(f"Invalid move: {move_str}")
-        
-        print(f"Position set: {self.board.fen()}")
+                    raise ValueError(f"Invalid move: {move_str}")
+        
+        # (fen, board, moves, resulting move stack) to recognise the next extension
+        self._last_position = (fen, self.board, list(moves), list(self.board.move_stack))
+        self.output(f"Position set: {self.board.fen()}")
     
     def evaluate_position_internal(self, board: chess.Board) -> Tuple[int, Dict[str, Any]]:
         """
@@ -133,8 +188,19 @@ class ChessEngine:
             Tuple of (score, detailed_thoughts) where detailed_thoughts
             contains breakdown of all evaluation components for data collection.
         """
-        # Get detailed evaluation breakdown (YOUR CUSTOM LOGIC)
-        eval_result = self.evaluator.evaluate_detailed(board)
+        # Get detailed evaluation breakdown (YOUR CUSTOM LOGIC), reusing a
+        # cached result when this exact position was already evaluated
+        key = chess.polyglot.zobrist_hash(board)
+        index = key & self.eval_cache_mask
+        entry = self.eval_cache[index]
+        
+        # Game phase depends on the move number, which the hash does not cover
+        if (entry is not None and entry[0] == key and entry[1] == board.fullmove_number
+                and entry[2] == self.eval_cache_gen):
+            eval_result = entry[3]
+        else:
+            eval_result = self.evaluator.evaluate_detailed(board)
+            self.eval_cache[index] = (key, board.fullmove_number, self.eval_cache_gen, eval_result)
         
         # Collect "thoughts" - individual evaluation decisions
         thought_data = {
@@ -156,16 +222,28 @@ class ChessEngine:
         total_score = eval_result.get('total_score', 0)
         return total_score, thought_data
     
+    def clear_eval_cache(self):
+        """
+        Invalidate all cached evaluations after evaluation parameters change.
+        
+        Starting a new generation retires every entry at once without
+        reallocating the table; stale slots are simply overwritten when reached.
+        """
+        self.eval_cache_gen += 1
+    
     def search_position(self, depth: Optional[int] = None, 
-                       time_limit: Optional[float] = None) -> SearchInfo:
+                       time_limit: Optional[float] = None,
+                       should_stop: Optional[Callable[[], bool]] = None) -> SearchInfo:
         """
         Search the current position using hybrid approach.
         
         This method uses python-chess for search infrastructure while
-        injecting our custom evaluation at each node.
+        injecting our custom evaluation at each node. If given, should_stop
+        is polled with the clock and ends the search early once it is true.
         """
         search_depth = depth or self.search_depth
         search_time = time_limit or self.time_limit
+        self.should_stop = should_stop or _never_stop
         
         start_time = time.time()
         nodes_searched = 0
@@ -174,21 +252,24 @@ class ChessEngine:
         self.thought_collector.clear()
         self.idea_collector.clear()
         
-        print(f"Searching position to depth {search_depth}...")
+        self.output(f"Searching position to depth {search_depth}...")
         
-        # Use iterative deepening with custom evaluation
-        best_move = None
+        # Use iterative deepening with custom evaluation. Seed the result with
+        # the first ordered legal move so a stop before depth 1 has searched
+        # anything still yields a playable move rather than a null one.
+        principal_variation = self._order_moves(list(self.board.legal_moves))[:1]
+        best_move = principal_variation[0] if principal_variation else None
         best_score = 0
-        principal_variation = []
         
         for current_depth in range(1, search_depth + 1):
-            if time.time() - start_time > search_time:
+            if time.time() - start_time > search_time or self.should_stop():
                 break
                 
             # Perform search at current depth
             result = self._search_depth(current_depth, start_time, search_time)
             
-            if result:
+            # An iteration stopped before its first move has nothing to report
+            if result and result[0] is not None:
                 best_move, best_score, pv, depth_nodes = result
                 principal_variation = pv
                 nodes_searched += depth_nodes
@@ -204,8 +285,8 @@ class ChessEngine:
                 }
                 self.idea_collector.add_idea(idea_data)
                 
-                print(f"Depth {current_depth}: {best_move} (score: {best_score}) "
-                      f"PV: {' '.join(str(m) for m in pv[:5])}")
+                self.output(f"Depth {current_depth}: {best_move} (score: {best_score}) "
+                            f"PV: {' '.join(str(m) for m in pv[:5])}")
         
         elapsed_time = time.time() - start_time
         nps = int(nodes_searched / max(elapsed_time, 0.001))
@@ -228,7 +309,7 @@ class ChessEngine:
         """
         Search to a specific depth using alpha-beta with custom evaluation.
         """
-        if time.time() - start_time > time_limit:
+        if time.time() - start_time > time_limit or self.should_stop():
             return None
             
         # Use alpha-beta search with custom evaluation injection
@@ -247,7 +328,7 @@ class ChessEngine:
         ordered_moves = self._order_moves(legal_moves)
         
         for move in ordered_moves:
-            if time.time() - start_time > time_limit:
+            if time.time() - start_time > time_limit or self.should_stop():
                 break
                 
             # Make move using python-chess
@@ -281,7 +362,7 @@ class ChessEngine:
         """
         Alpha-beta search with custom evaluation injection.
         """
-        if time.time() - start_time > time_limit:
+        if time.time() - start_time > time_limit or self.should_stop():
             return 0, [], 0
             
         if depth <= 0:
@@ -289,21 +370,26 @@ class ChessEngine:
             score, _ = self.evaluate_position_internal(self.board)
             return score, [], 1
             
-        # Check for terminal positions
-        if self.board.is_checkmate():
-            return -20000 + (10 - depth), [], 1
-        elif self.board.is_stalemate() or self.board.is_insufficient_material():
+        # Check for terminal positions, generating legal moves only once
+        legal_moves = list(self.board.legal_moves)
+        if not legal_moves:
+            if self.board.is_check():
+                return -20000 + (10 - depth), [], 1
+            return 0, [], 1  # Stalemate
+        
+        # Insufficient material is impossible while pawns, rooks or queens remain
+        if (not (self.board.pawns | self.board.rooks | self.board.queens)
+                and self.board.is_insufficient_material()):
             return 0, [], 1
             
         best_score = alpha
         best_pv = []
         nodes = 0
         
-        legal_moves = list(self.board.legal_moves)
         ordered_moves = self._order_moves(legal_moves)
         
         for move in ordered_moves:
-            if time.time() - start_time > time_limit:
+            if time.time() - start_time > time_limit or self.should_stop():
                 break
                 
             self.board.push(move)
@@ -394,30 +480,34 @@ class ChessEngine:
     # === User-Friendly Interface Methods ===
     
     def get_best_move(self, depth: Optional[int] = None, 
-                     time_limit: Optional[float] = None) -> Optional[chess.Move]:
+                     time_limit: Optional[float] = None,
+                     should_stop: Optional[Callable[[], bool]] = None) -> Optional[chess.Move]:
         """
         Get the best move for the current position.
+        
+        should_stop lets a caller (the UCI 'stop' command) cut the search
+        short, exactly as if the time limit had run out.
         """
         search_depth = depth or self.search_depth
         search_time = time_limit or self.time_limit
         
-        print(f"\\nSearching position (depth: {search_depth}, time: {search_time}s)...")
+        self.output(f"\\nSearching position (depth: {search_depth}, time: {search_time}s)...")
         
         # Use the hybrid search that combines efficiency with custom evaluation
-        search_result = self.search_position(search_depth, search_time)
+        search_result = self.search_position(search_depth, search_time, should_stop)
         
         # Display search statistics
-        print(f"Search completed:")
-        print(f"  Nodes searched: {search_result.nodes:,}")
-        print(f"  Time taken: {search_result.time_ms/1000:.3f}s")
-        print(f"  NPS: {search_result.nps:,}")
-        print(f"  Evaluation: {search_result.score}")
-        print(f"  Thoughts collected: {search_result.thoughts_collected}")
-        print(f"  Ideas formed: {search_result.ideas_formed}")
+        self.output(f"Search completed:")
+        self.output(f"  Nodes searched: {search_result.nodes:,}")
+        self.output(f"  Time taken: {search_result.time_ms/1000:.3f}s")
+        self.output(f"  NPS: {search_result.nps:,}")
+        self.output(f"  Evaluation: {search_result.score}")
+        self.output(f"  Thoughts collected: {search_result.thoughts_collected}")
+        self.output(f"  Ideas formed: {search_result.ideas_formed}")
         
         if search_result.pv:
             pv_str = ' '.join(str(move) for move in search_result.pv[:5])
-            print(f"  Principal variation: {pv_str}")
+            self.output(f"  Principal variation: {pv_str}")
             return search_result.pv[0]
         
         return None
@@ -525,6 +615,7 @@ class ChessEngine:
             if hasattr(self.evaluator, attr_name):
                 old_value = getattr(self.evaluator, attr_name)
                 setattr(self.evaluator, attr_name, int(value))
+                self.clear_eval_cache()
                 print(f"Tuned {parameter}: {old_value} -> {int(value)}")
             else:
                 print(f"Parameter {parameter} not found in evaluator")
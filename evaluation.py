@@ -62,6 +62,12 @@ class Evaluation:
         
         # Initialize enhanced PST tables
         self._init_piece_square_tables()
+        
+        # SEE scratch buffer - reused across captures instead of allocating per call
+        self._see_gain = [0] * 32
+        
+        # SEE attacker piece types, cheapest first
+        self._see_attacker_order = sorted(self.piece_values, key=self.piece_values.get)
     
     def evaluate(self, board: chess.Board) -> int:
         """
@@ -534,8 +540,9 @@ class Evaluation:
         if not victim:
             return 0
             
-        # Start the exchange sequence
-        gain = [self.piece_values[victim.piece_type]]
+        # Start the exchange sequence in the preallocated scratch buffer
+        gain = self._see_gain
+        gain[0] = self.piece_values[victim.piece_type]
         
         # Make the initial capture
         board_copy = board.copy()
@@ -549,64 +556,73 @@ class Evaluation:
             return gain[0]  # No attacker somehow
         
         # Continue the exchange sequence
-        self._see_continue_exchange(board_copy, target_square, attacking_piece_value, gain)
+        depth = self._see_continue_exchange(board_copy, target_square, attacking_piece_value, gain, 1)
         
         # Calculate final result using minimax
-        return self._see_minimax_gain(gain)
+        return self._see_minimax_gain(gain, depth)
     
     def _see_continue_exchange(self, board: chess.Board, square: chess.Square, 
-                              last_attacker_value: int, gain: List[int]):
-        """Continue the SEE exchange sequence recursively."""
+                              last_attacker_value: int, gain: List[int], depth: int) -> int:
+        """
+        Continue the SEE exchange sequence recursively.
+        
+        Returns:
+            Number of entries of gain filled by the exchange sequence
+        """
+        if depth >= len(gain):
+            return depth  # Scratch buffer exhausted
         
         # Find the least valuable attacker
         attacker_move = self._see_find_least_valuable_attacker(board, square)
         
         if not attacker_move:
-            return  # No more attackers
+            return depth  # No more attackers
             
         # Get the attacking piece
         attacker = board.piece_at(attacker_move.from_square)
         if not attacker:
-            return
+            return depth
             
         attacker_value = self.piece_values[attacker.piece_type]
         
         # Add the captured piece value to gain
-        gain.append(last_attacker_value - gain[-1])
+        gain[depth] = last_attacker_value - gain[depth - 1]
         
         # Make the capture
         board.push(attacker_move)
         
         # Continue recursively
-        self._see_continue_exchange(board, square, attacker_value, gain)
+        return self._see_continue_exchange(board, square, attacker_value, gain, depth + 1)
     
     def _see_find_least_valuable_attacker(self, board: chess.Board, 
                                         square: chess.Square) -> Optional[chess.Move]:
         """Find the least valuable piece that can attack the square."""
         
-        attacking_moves = []
+        # Attack bitboard from python-chess's precomputed ray tables
+        attackers = board.attackers_mask(board.turn, square)
+        if not attackers:
+            return None
+        
+        promotion = chess.QUEEN if chess.square_rank(square) in (0, 7) else None
         
-        # Check all legal moves for attacks on the square
-        for move in board.legal_moves:
-            if move.to_square == square and board.is_capture(move):
-                attacker = board.piece_at(move.from_square)
-                if attacker:
-                    attacking_moves.append((move, self.piece_values[attacker.piece_type]))
+        # Return the first legal capture by the least valuable attacker
+        for piece_type in self._see_attacker_order:
+            candidates = attackers & board.pieces_mask(piece_type, board.turn)
+            for from_square in chess.scan_reversed(candidates):
+                move = chess.Move(from_square, square,
+                                  promotion if piece_type == chess.PAWN else None)
+                if board.is_legal(move):
+                    return move
         
-        if not attacking_moves:
-            return None
-            
-        # Return move with least valuable attacker
-        attacking_moves.sort(key=lambda x: x[1])
-        return attacking_moves[0][0]
+        return None
     
-    def _see_minimax_gain(self, gain: List[int]) -> int:
-        """Calculate final SEE gain using minimax principle."""
-        if not gain:
+    def _see_minimax_gain(self, gain: List[int], depth: int) -> int:
+        """Calculate final SEE gain using minimax principle over gain[:depth]."""
+        if not depth:
             return 0
             
         # Work backwards through the gain list
-        for i in range(len(gain) - 2, -1, -1):
+        for i in range(depth - 2, -1, -1):
             gain[i] = max(0, gain[i] - gain[i + 1])
             
         return gain[0]
@@ -661,26 +677,12 @@ class Evaluation:
     def _is_piece_hanging(self, board: chess.Board, square: chess.Square, 
                          color: chess.Color) -> bool:
         """Check if a piece is hanging (attacked but not defended)."""
-        
-        # Count attackers by opponent
-        attackers = 0
-        for attacker_square in chess.SQUARES:
-            piece = board.piece_at(attacker_square)
-            if piece and piece.color != color:
-                if square in board.attacks(attacker_square):
-                    attackers += 1
-        
+        # One bitboard lookup per side instead of scanning all 64 squares
+        attackers = chess.popcount(board.attackers_mask(not color, square))
         if attackers == 0:
             return False  # Not attacked
         
-        # Count defenders
-        defenders = 0
-        for defender_square in chess.SQUARES:
-            piece = board.piece_at(defender_square)
-            if piece and piece.color == color and defender_square != square:
-                if square in board.attacks(defender_square):
-                    defenders += 1
-        
+        defenders = chess.popcount(board.attackers_mask(color, square))
         return attackers > defenders
 
     def _evaluate_side_castling(self, board: chess.Board, color: chess.Color,
@@ -6,16 +6,48 @@ Implements advanced sequence testing and evaluation analysis
 
 import csv
 import random
+import re
 import json
+import queue
 import subprocess
 import time
 import os
-from typing import Dict, List, Optional, Tuple
+import sys
+import multiprocessing.util
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import chess
 
-@dataclass
+from puzzle_common import StdoutPump, load_index
+
+# Fixed UCI commands, encoded once and written straight to the engine's stdin fd
+_UCI = b"uci\n"
+_ISREADY = b"isready\n"
+_UCINEWGAME = b"ucinewgame\n"
+_STOP = b"stop\n"
+_QUIT = b"quit\n"
+
+def _engine_version(engine_path: str) -> str:
+    """
+    Identify the engine binary for eval cache keys.
+    
+    The file name alone is not enough: a rebuilt or retuned engine usually keeps
+    its name, so the size and modification time are folded in too.
+    """
+    try:
+        stat = os.stat(engine_path)
+    except OSError:
+        return Path(engine_path).stem
+    return f"{Path(engine_path).stem}@{stat.st_size}:{stat.st_mtime_ns}"
+
+# Results pile up by the thousand across sessions; slot them where dataclasses support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class PuzzleMoveResult:
     """Result for a single move in a puzzle sequence."""
     move_number: int
@@ -27,7 +59,7 @@ class PuzzleMoveResult:
     search_depth: Optional[int] = None
     time_taken: float = 0.0
 
-@dataclass
+@dataclass(**_SLOTS)
 class PuzzleSequenceResult:
     """Result for testing an entire puzzle sequence."""
     puzzle_id: str
@@ -46,7 +78,7 @@ class PuzzleSequenceResult:
         """Calculate percentage of moves solved correctly."""
         return (self.moves_solved / self.total_moves * 100) if self.total_moves > 0 else 0.0
 
-@dataclass
+@dataclass(**_SLOTS)
 class Puzzle:
     """Container for puzzle data."""
     puzzle_id: str
@@ -71,35 +103,45 @@ class Puzzle:
 class EnhancedPuzzleTester:
     """Advanced puzzle tester with sequence analysis and evaluation debugging."""
     
+    # Standard UCI "info ... score cp/mate N", or Cece's own "Evaluation: N" line
+    _SCORE_RE = re.compile(r'(?:\bscore\s+(cp|mate)|Evaluation:)\s+(-?\d+)')
+    
     def __init__(self, engine_path: str, csv_path: str):
         self.engine_path = engine_path
         self.csv_path = csv_path
-        self.solved_puzzles_file = "solved_puzzles.json"
-        self.results_file = "puzzle_sequence_results.json"
+        self.solved_puzzles_file = "solved_puzzles.txt"
+        self.results_file = "puzzle_sequence_results.jsonl"
         self.analytics_file = "puzzle_analytics.json"
+        self.eval_cache_file = "eval_cache.json"
+        self.engine_version = _engine_version(engine_path)
         
         # Load previously solved puzzles and results
         self.solved_puzzles = self._load_solved_puzzles()
         self.results = self._load_results()
         
+        # Engine answers keyed by (position, time limit, engine version)
+        self.eval_cache: Dict[Tuple[str, float, str], Tuple[str, Optional[int], Optional[int]]] = self._load_eval_cache()
+        
+        # Persistent engine process, started on first use and reused across positions
+        self.engine: Optional[subprocess.Popen] = None
+        
     def _load_solved_puzzles(self) -> set:
-        """Load set of previously solved puzzle IDs."""
+        """Load set of previously solved puzzle IDs, one per line."""
         if os.path.exists(self.solved_puzzles_file):
             with open(self.solved_puzzles_file, 'r') as f:
-                return set(json.load(f))
+                return set(f.read().split())
         return set()
     
-    def _save_solved_puzzles(self):
-        """Save solved puzzle IDs."""
-        with open(self.solved_puzzles_file, 'w') as f:
-            json.dump(list(self.solved_puzzles), f)
+    def _save_solved_puzzle(self, puzzle_id: str):
+        """Append a newly solved puzzle ID."""
+        with open(self.solved_puzzles_file, 'a') as f:
+            f.write(f"{puzzle_id}\n")
     
     def _load_results(self) -> List[PuzzleSequenceResult]:
-        """Load previous test results."""
+        """Load previous test results, one JSON object per line."""
         if os.path.exists(self.results_file):
             with open(self.results_file, 'r') as f:
-                data = json.load(f)
-                return [self._dict_to_result(item) for item in data]
+                return [self._dict_to_result(json.loads(line)) for line in f if line.strip()]
         return []
     
     def _dict_to_result(self, data: Dict) -> PuzzleSequenceResult:
@@ -119,256 +161,335 @@ class EnhancedPuzzleTester:
             notes=data.get('notes', '')
         )
     
-    def _save_results(self):
-        """Save test results."""
-        with open(self.results_file, 'w') as f:
-            json.dump([asdict(result) for result in self.results], f, indent=2)
+    def _save_result(self, result: PuzzleSequenceResult):
+        """Append a single test result so finished puzzles survive an interrupted session."""
+        with open(self.results_file, 'a') as f:
+            f.write(json.dumps(asdict(result)) + "\n")
+    
+    def _load_eval_cache(self) -> Dict[Tuple[str, float, str], Tuple[str, Optional[int], Optional[int]]]:
+        """Load cached engine answers from previous sessions, dropping older builds of this engine."""
+        if os.path.exists(self.eval_cache_file):
+            stem = Path(self.engine_path).stem
+            with open(self.eval_cache_file, 'r') as f:
+                return {tuple(entry[:3]): tuple(entry[3:]) for entry in json.load(f)
+                        if entry[2] == self.engine_version or entry[2].split('@')[0] != stem}
+        return {}
+    
+    def _save_eval_cache(self):
+        """Save cached engine answers as flat [position, time, version, move, eval, depth] rows."""
+        with open(self.eval_cache_file, 'w') as f:
+            json.dump([[*key, *value] for key, value in self.eval_cache.items()], f)
+    
+    def _eval_cache_key(self, fen: str, time_limit: float,
+                        moves: Optional[List[str]] = None) -> Tuple[str, float, str]:
+        """
+        Cache key for a position, canonicalized so equivalent positions share an entry.
+        
+        EPD drops the halfmove clock and fullmove number, keeps castling rights only
+        where they are still real, and keeps the en passant square only when an en
+        passant capture is actually legal.
+        """
+        board = chess.Board(fen)
+        for move in moves or ():
+            board.push_uci(move)
+        return (board.epd(en_passant="legal"), time_limit, self.engine_version)
+    
+    def _cached_answers(self, puzzle: Puzzle, time_limit: float) -> Dict:
+        """Cached engine answers for the positions a puzzle asks the engine about."""
+        entries = {}
+        for ply in range(0, len(puzzle.moves), 2):
+            try:
+                key = self._eval_cache_key(puzzle.fen, time_limit, puzzle.moves[:ply])
+            except ValueError:
+                break  # Invalid move in the puzzle; the sequence stops here anyway
+            if key in self.eval_cache:
+                entries[key] = self.eval_cache[key]
+        return entries
     
     def get_random_puzzles(self, count: int, 
                           rating_min: int = 1200, rating_max: int = 1800,
                           themes_filter: Optional[List[str]] = None) -> List[Puzzle]:
         """Get random puzzles matching criteria, excluding already solved ones."""
-        puzzles = []
-        seen_ids = set()
-        
         print(f"🔍 Searching for {count} puzzles (rating {rating_min}-{rating_max})")
         if themes_filter:
             print(f"   Themes: {', '.join(themes_filter)}")
         
-        # Read CSV and collect matching puzzles
-        with open(self.csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            
-            for row_num, row in enumerate(reader):
-                if len(row) < 8:
-                    continue
-                    
-                puzzle_id = row[0]
-                if puzzle_id in self.solved_puzzles or puzzle_id in seen_ids:
-                    continue
-                    
-                # Check rating
-                try:
-                    rating = int(row[3])
-                    if not (rating_min <= rating <= rating_max):
-                        continue
-                except (ValueError, IndexError):
-                    continue
-                
-                # Check themes filter
-                if themes_filter:
-                    puzzle_themes = row[7].split()
-                    if not any(theme in puzzle_themes for theme in themes_filter):
-                        continue
-                
-                puzzle = Puzzle.from_csv_row(row)
-                puzzles.append(puzzle)
-                seen_ids.add(puzzle_id)
-                
-                # Stop if we have enough candidates
-                if len(puzzles) >= count * 5:  # Get 5x more for random selection
+        index = load_index(self.csv_path)
+        ratings = index['ratings']
+        
+        # Filter on the index columns only - no CSV parsing
+        if themes_filter:
+            rows = set()
+            for theme in themes_filter:
+                rows.update(index['theme_rows'].get(theme, ()))
+            candidates = [row for row in sorted(rows) if rating_min <= ratings[row] <= rating_max]
+        else:
+            candidates = [row for row, rating in enumerate(ratings) if rating_min <= rating <= rating_max]
+        
+        print(f"✅ Found {len(candidates)} matching puzzles")
+        
+        # Materialize only the randomly chosen rows, skipping solved puzzles
+        random.shuffle(candidates)
+        selected = []
+        with open(self.csv_path, 'rb') as f:
+            for row in candidates:
+                if len(selected) >= count:
                     break
-                    
-                # Progress indicator
-                if row_num % 100000 == 0 and row_num > 0:
-                    print(f"   Scanned {row_num:,} puzzles, found {len(puzzles)} matches")
-        
-        print(f"✅ Found {len(puzzles)} matching puzzles")
-        # Return random sample
-        selected = random.sample(puzzles, min(count, len(puzzles)))
+                f.seek(index['offsets'][row])
+                fields = next(csv.reader([f.readline().decode('utf-8')]))
+                if fields[0] in self.solved_puzzles:
+                    continue
+                selected.append(Puzzle.from_csv_row(fields))
+        
         print(f"📋 Selected {len(selected)} puzzles for testing")
         return selected
     
-    def test_engine_move(self, fen: str, time_limit: float = 5.0) -> Tuple[Optional[str], float, Optional[int]]:
-        """Test engine on a single position and return best move, time, and evaluation."""
+    def __enter__(self) -> 'EnhancedPuzzleTester':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _start_engine(self):
+        """Start the engine process and complete the UCI handshake."""
+        self.engine = subprocess.Popen(
+            self.engine_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT  # One pipe to drain, so stderr can never fill up
+        )
+        self._q: queue.Queue = queue.Queue()
+        self._fd = self.engine.stdin.fileno()
+        self._buf = bytearray()  # Scratch buffer for building position commands
+        StdoutPump(self.engine.stdout, self._q).start()
+        self._handshake()
+    
+    def _handshake(self):
+        """Drain the uci/uciok and isready/readyok exchange."""
+        self._send(_UCI)
+        self._expect("uciok", 2)
+        self._send(_ISREADY)
+        self._expect("readyok", 2)
+    
+    def _expect(self, reply: str, timeout: float):
+        """Wait for an exact reply line; raise if the engine has not sent it by the deadline."""
+        lines = self._read_until(lambda line: line == reply, timeout)
+        if not lines or lines[-1] != reply:
+            raise RuntimeError(f"Engine did not answer '{reply}' within {timeout}s")
+    
+    def _send(self, cmd: bytes):
+        """Send a single newline-terminated UCI command, bypassing stdin's buffer."""
+        written = os.write(self._fd, cmd)
+        while written < len(cmd):  # Only a pipe full of unread input splits a write
+            written += os.write(self._fd, cmd[written:])
+    
+    def _send_position(self, fen: str, moves: Optional[List[str]] = None):
+        """Send "position fen ... [moves ...]", built in the reused scratch buffer."""
+        buf = self._buf
+        buf.clear()
+        buf += b"position fen "
+        buf += fen.encode('ascii')
+        if moves:
+            buf += b" moves "
+            buf += ' '.join(moves).encode('ascii')
+        buf += b"\n"
+        self._send(buf)
+    
+    def _read_until(self, pred: Callable[[str], bool], timeout: float) -> List[str]:
+        """
+        Read engine output lines until one satisfies pred or the timeout expires.
+        
+        Returns:
+            All lines read, ending with the matching line unless the timeout expired
+        """
+        lines = []
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = self._q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                raise RuntimeError("Engine closed its output")
+            lines.append(line)
+            if pred(line):
+                break
+        return lines
+    
+    def close(self):
+        """Send quit to the engine process and wait for it to exit."""
+        if self.engine is None:
+            return
         try:
-            # Start engine process
-            engine = subprocess.Popen(
-                self.engine_path,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0
-            )
+            if self.engine.poll() is None:
+                self._send(_QUIT)
+                self.engine.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.engine.kill()
+            self.engine.wait()
+        self.engine = None
+    
+    def test_engine_move(self, fen: str, time_limit: float = 5.0,
+                         moves: Optional[List[str]] = None,
+                         new_game: bool = True) -> Tuple[Optional[str], float, Optional[int]]:
+        """
+        Test engine on a single position and return best move, time, and evaluation.
+        
+        The position is fen followed by moves. Pass new_game=False for later plies of
+        the same game so the engine keeps its hash table between them.
+        """
+        key = self._eval_cache_key(fen, time_limit, moves)
+        if key in self.eval_cache:
+            engine_move, evaluation_score, _ = self.eval_cache[key]
+            return engine_move, 0.0, evaluation_score
+        
+        try:
+            if self.engine is None or self.engine.poll() is not None:
+                self._start_engine()
+            
+            start_time = time.monotonic()
             
-            start_time = time.time()
+            # Set up the position on the already-handshaked engine
+            if new_game:
+                self._send(_UCINEWGAME)
+            self._send_position(fen, moves)
+            self._send(_ISREADY)
+            self._expect("readyok", 5)
             
-            # Send UCI commands with proper sequencing
-            commands = [
-                "uci",
-                "isready",
-                f"position fen {fen}",
-                f"go movetime {int(time_limit * 1000)}"  # Convert to milliseconds
-            ]
+            # Now send the go command and wait for bestmove with timeout
+            self._send(b"go movetime %d\n" % (time_limit * 1000))  # Convert to milliseconds
+            is_bestmove = lambda line: line.startswith("bestmove")
+            output = self._read_until(is_bestmove, time_limit + 0.2)
+            if not output or not is_bestmove(output[-1]):
+                # Past its movetime: ask the engine to stop and report what it has
+                self._send(_STOP)
+                output += self._read_until(is_bestmove, 2)
             
-            # Send commands and collect output
-            all_output = []
             engine_move = None
             evaluation_score = None
-            
-            for cmd in commands[:3]:  # Send first 3 commands
-                if engine.stdin:
-                    engine.stdin.write(f"{cmd}\n")
-                    engine.stdin.flush()
+            for line in output:
+                # Extract evaluation score if present; the last one reported wins
+                match = self._SCORE_RE.search(line)
+                if match:
+                    evaluation_score = int(match.group(2)) * (100000 if match.group(1) == "mate" else 1)
                 
-                if cmd == "uci":
-                    # Wait for uciok
-                    while True:
-                        if engine.stdout:
-                            line = engine.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                all_output.append(line)
-                                if line == "uciok":
-                                    break
-                elif cmd == "isready":
-                    # Wait for readyok
-                    while True:
-                        if engine.stdout:
-                            line = engine.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                all_output.append(line)
-                                if line == "readyok":
-                                    break
-                elif cmd.startswith("position"):
-                    # Brief pause for position setting
-                    time.sleep(0.1)
-                    # Read any immediate response
-                    if engine.stdout:
-                        try:
-                            line = engine.stdout.readline()
-                            if line:
-                                all_output.append(line.strip())
-                        except:
-                            pass
+                if line.startswith("bestmove"):
+                    parts = line.split()
+                    if len(parts) > 1 and parts[1] != "0000":
+                        engine_move = parts[1]
             
-            # Now send the go command
-            if engine.stdin:
-                engine.stdin.write(f"{commands[3]}\n")
-                engine.stdin.flush()
+            if not output or not is_bestmove(output[-1]):
+                # Engine ignored stop and is still searching; restart it for the next position
+                self.close()
+            elif engine_move:
+                self.eval_cache[key] = (engine_move, evaluation_score, None)
             
-            # Wait for bestmove with timeout
-            search_start = time.time()
-            while time.time() - search_start < time_limit + 2:
-                if engine.stdout:
-                    line = engine.stdout.readline()
-                    if line:
-                        line = line.strip()
-                        all_output.append(line)
-                        
-                        # Extract evaluation score if present
-                        if "Evaluation:" in line:
-                            try:
-                                eval_part = line.split("Evaluation:")[1].strip()
-                                evaluation_score = int(eval_part.split()[0])
-                            except:
-                                pass
-                        
-                        if line.startswith("bestmove"):
-                            parts = line.split()
-                            if len(parts) > 1 and parts[1] != "0000":
-                                engine_move = parts[1]
-                            break
-                else:
-                    time.sleep(0.01)
-            
-            # Clean up
-            if engine.stdin:
-                engine.stdin.write("quit\n")
-                engine.stdin.flush()
-            engine.wait(timeout=2)
-            
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             return engine_move, elapsed, evaluation_score
             
         except Exception as e:
             print(f"   ❌ Engine error: {e}")
+            self.close()
             return None, 0.0, None
     
-    def test_puzzle_sequence(self, puzzle: Puzzle, time_limit: float = 5.0) -> PuzzleSequenceResult:
-        """Test engine on complete puzzle sequence with correct move alternation."""
-        print(f"\n🧩 Testing Puzzle {puzzle.puzzle_id}")
-        print(f"   Rating: {puzzle.rating}")
-        print(f"   Themes: {' '.join(puzzle.themes)}")
-        print(f"   Solution: {' '.join(puzzle.moves)}")
+    def test_puzzle_sequence(self, puzzle: Puzzle, time_limit: float = 5.0,
+                             stop_on_failure: bool = True,
+                             verbose: bool = True) -> PuzzleSequenceResult:
+        """
+        Test engine on complete puzzle sequence with correct move alternation.
+        
+        With stop_on_failure the sequence ends at the first wrong engine move, since
+        later moves can no longer make the puzzle fully solved. verbose=False keeps
+        only warnings and the final verdict, for quick runs with short time limits.
+        """
+        if verbose:
+            print(f"\n🧩 Testing Puzzle {puzzle.puzzle_id}")
+            print(f"   Rating: {puzzle.rating}")
+            print(f"   Themes: {' '.join(puzzle.themes)}")
+            print(f"   Solution: {' '.join(puzzle.moves)}")
         
         move_results = []
         current_board = chess.Board(puzzle.fen)
+        played_moves: List[str] = []  # Sent to the engine as "position fen ... moves ..."
         moves_solved = 0
         total_time = 0.0
         
-        # Determine who is to move first from the FEN
-        side_to_move = current_board.turn
-        print(f"   Initial position: {'White' if side_to_move else 'Black'} to move")
+        if verbose:
+            print(f"   Initial position: {'White' if current_board.turn else 'Black'} to move")
         
-        # Process moves in pairs: [engine_move, opponent_response, engine_move, opponent_response, ...]
-        engine_moves_count = 0
+        # Moves alternate [engine_move, opponent_response, engine_move, ...]; split them up
+        # front and walk them in pairs, the last engine move having no response
+        ply_pairs = zip_longest(puzzle.moves[0::2], puzzle.moves[1::2])
         
-        for move_num, expected_move in enumerate(puzzle.moves, 1):
-            # Determine if this move should be played by the engine or opponent
-            is_engine_move = (move_num % 2 == 1)  # Odd-numbered moves are engine moves
-            
-            if is_engine_move:
-                engine_moves_count += 1
-                print(f"\n   Engine Move {engine_moves_count}: Testing position {current_board.fen()}")
+        for engine_moves_count, (expected_move, opponent_move) in enumerate(ply_pairs, 1):
+            position_fen = current_board.fen()  # Built once, used for the log and the result
+            if verbose:
+                print(f"\n   Engine Move {engine_moves_count}: Testing position {position_fen}")
                 print(f"   Expected: {expected_move}")
-                
-                # Test engine on current position
-                engine_move, move_time, evaluation = self.test_engine_move(
-                    current_board.fen(), time_limit
-                )
-                total_time += move_time
-                
-                correct = engine_move == expected_move
-                if correct:
-                    moves_solved += 1
+            
+            # Test engine on current position
+            engine_move, move_time, evaluation = self.test_engine_move(
+                puzzle.fen, time_limit, moves=played_moves,
+                new_game=(engine_moves_count == 1)
+            )
+            total_time += move_time
+            
+            correct = engine_move == expected_move
+            if correct:
+                moves_solved += 1
+                if verbose:
                     print(f"   ✅ Correct! Engine played: {engine_move}")
-                else:
-                    print(f"   ❌ Wrong! Engine played: {engine_move}, expected: {expected_move}")
-                    if evaluation is not None:
-                        print(f"      Engine evaluation: {evaluation}")
-                
-                # Record result for engine moves only
-                move_result = PuzzleMoveResult(
-                    move_number=engine_moves_count,
-                    expected_move=expected_move,
-                    engine_move=engine_move or "timeout",
-                    position_fen=current_board.fen(),
-                    correct=correct,
-                    evaluation_score=evaluation,
-                    time_taken=move_time
-                )
-                move_results.append(move_result)
-                
-                # Apply the expected move to continue sequence
-                try:
-                    move = chess.Move.from_uci(expected_move)
-                    current_board.push(move)
-                except:
-                    print(f"   ⚠️  Invalid move in puzzle: {expected_move}")
-                    break
-                    
-                # If engine got it wrong, we might want to stop the sequence
-                if not correct:
+            elif verbose:
+                print(f"   ❌ Wrong! Engine played: {engine_move}, expected: {expected_move}")
+                if evaluation is not None:
+                    print(f"      Engine evaluation: {evaluation}")
+            
+            # Record result for engine moves only
+            move_result = PuzzleMoveResult(
+                move_number=engine_moves_count,
+                expected_move=expected_move,
+                engine_move=engine_move or "timeout",
+                position_fen=position_fen,
+                correct=correct,
+                evaluation_score=evaluation,
+                time_taken=move_time
+            )
+            move_results.append(move_result)
+            
+            # Apply the expected move to continue sequence
+            try:
+                current_board.push_uci(expected_move)
+                played_moves.append(expected_move)
+            except ValueError:
+                print(f"   ⚠️  Invalid move in puzzle: {expected_move}")
+                break
+            
+            # If engine got it wrong, stop the sequence unless the caller wants
+            # to see how the engine handles the remaining positions
+            if not correct and stop_on_failure:
+                if verbose:
                     print(f"   🛑 Engine failed - stopping sequence evaluation")
-                    # Still apply the correct move to continue analysis if desired
-                    # (this allows us to see how the engine would handle subsequent positions)
-                    
-            else:
-                # This is an opponent move - just apply it
-                print(f"   Opponent plays: {expected_move}")
-                try:
-                    move = chess.Move.from_uci(expected_move)
-                    current_board.push(move)
-                except:
-                    print(f"   ⚠️  Invalid opponent move: {expected_move}")
-                    break
+                break
+            
+            if opponent_move is None:
+                break
+            
+            # This is an opponent move - just apply it
+            if verbose:
+                print(f"   Opponent plays: {opponent_move}")
+            try:
+                current_board.push_uci(opponent_move)
+                played_moves.append(opponent_move)
+            except ValueError:
+                print(f"   ⚠️  Invalid opponent move: {opponent_move}")
+                break
         
-        # Calculate total engine moves (only odd-numbered moves in sequence)
-        total_engine_moves = engine_moves_count
+        # Calculate total engine moves (only odd-numbered moves in sequence),
+        # including any skipped after an early stop
+        total_engine_moves = (len(puzzle.moves) + 1) // 2
         fully_solved = moves_solved == total_engine_moves
         success_rate = (moves_solved / total_engine_moves * 100) if total_engine_moves > 0 else 0
         
@@ -394,8 +515,15 @@ class EnhancedPuzzleTester:
         
         return result
     
-    def run_test_session(self, count: int = 10, **kwargs):
-        """Run a comprehensive test session."""
+    def run_test_session(self, count: int = 10, time_limit: float = 5.0,
+                         max_engines: Optional[int] = None, verbose: bool = True, **kwargs):
+        """
+        Run a comprehensive test session, one engine process per worker.
+        
+        max_engines caps how many engines search at once (and so their combined
+        memory); by default half the CPU count is used. verbose=False drops the
+        per-move output of each puzzle.
+        """
         print(f"🚀 Enhanced Puzzle Test Session")
         print(f"Testing {count} puzzles with sequence analysis")
         print("=" * 60)
@@ -409,15 +537,32 @@ class EnhancedPuzzleTester:
         session_results = []
         session_start = time.time()
         
-        for i, puzzle in enumerate(puzzles, 1):
-            print(f"\n[{i}/{len(puzzles)}] ", end="")
-            result = self.test_puzzle_sequence(puzzle)
-            session_results.append(result)
-            self.results.append(result)
+        if max_engines is None:
+            max_engines = (os.cpu_count() or 2) // 2
+        workers = max(1, min(len(puzzles), max_engines))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.engine_path, self.csv_path)) as executor:
+            futures = [executor.submit(_test_puzzle_worker, puzzle, time_limit, verbose,
+                                       self._cached_answers(puzzle, time_limit))
+                       for puzzle in puzzles]
+            for i, future in enumerate(as_completed(futures), 1):
+                try:
+                    result, cache_entries = future.result()
+                except Exception as e:
+                    print(f"\n[{i}/{len(puzzles)}] ❌ Worker error: {e}")
+                    continue
+                
+                print(f"\n[{i}/{len(puzzles)}] Finished puzzle {result.puzzle_id}")
+                session_results.append(result)
+                self.results.append(result)
+                self.eval_cache.update(cache_entries)
+                self._save_result(result)
+                if result.fully_solved and result.puzzle_id not in self.solved_puzzles:
+                    self.solved_puzzles.add(result.puzzle_id)
+                    self._save_solved_puzzle(result.puzzle_id)
         
-        # Save progress
-        self._save_solved_puzzles()
-        self._save_results()
+        # Results are already on disk; only the cache is rewritten
+        self._save_eval_cache()
         
         # Generate session analytics
         self._generate_session_analytics(session_results)
@@ -437,28 +582,32 @@ class EnhancedPuzzleTester:
         print(f"   Puzzles fully solved: {fully_solved}/{total_puzzles} ({fully_solved/total_puzzles*100:.1f}%)")
         print(f"   Individual moves solved: {moves_solved}/{total_moves} ({moves_solved/total_moves*100:.1f}%)")
         
-        # Theme analysis
-        theme_stats = {}
-        rating_stats = {}
+        # Single pass over the results, accumulating plain counters:
+        # [total, solved, moves_solved, total_moves] per theme, [total, solved] per 100-point bucket
+        theme_counts = defaultdict(lambda: [0, 0, 0, 0])
+        rating_counts = defaultdict(lambda: [0, 0])
         
         for result in session_results:
-            # Theme analysis
+            solved = int(result.fully_solved)
             for theme in result.themes:
-                if theme not in theme_stats:
-                    theme_stats[theme] = {'total': 0, 'solved': 0, 'moves_solved': 0, 'total_moves': 0}
-                theme_stats[theme]['total'] += 1
-                theme_stats[theme]['total_moves'] += result.total_moves
-                theme_stats[theme]['moves_solved'] += result.moves_solved
-                if result.fully_solved:
-                    theme_stats[theme]['solved'] += 1
+                counts = theme_counts[theme]
+                counts[0] += 1
+                counts[1] += solved
+                counts[2] += result.moves_solved
+                counts[3] += result.total_moves
             
-            # Rating analysis
-            rating_range = f"{(result.rating // 100) * 100}-{(result.rating // 100) * 100 + 99}"
-            if rating_range not in rating_stats:
-                rating_stats[rating_range] = {'total': 0, 'solved': 0}
-            rating_stats[rating_range]['total'] += 1
-            if result.fully_solved:
-                rating_stats[rating_range]['solved'] += 1
+            counts = rating_counts[result.rating // 100 * 100]
+            counts[0] += 1
+            counts[1] += solved
+        
+        theme_stats = {
+            theme: {'total': total, 'solved': solved, 'moves_solved': theme_moves_solved, 'total_moves': theme_moves}
+            for theme, (total, solved, theme_moves_solved, theme_moves) in theme_counts.items()
+        }
+        rating_stats = {
+            f"{bucket}-{bucket + 99}": {'total': total, 'solved': solved}
+            for bucket, (total, solved) in sorted(rating_counts.items())
+        }
         
         print(f"\n🎭 Theme Performance:")
         for theme, stats in sorted(theme_stats.items()):
@@ -469,7 +618,7 @@ class EnhancedPuzzleTester:
                       f"{stats['moves_solved']:3}/{stats['total_moves']:3} moves ({move_rate:5.1f}%)")
         
         print(f"\n🎯 Rating Performance:")
-        for rating_range, stats in sorted(rating_stats.items()):
+        for rating_range, stats in rating_stats.items():  # Already in numeric bucket order
             rate = stats['solved'] / stats['total'] * 100
             print(f"   {rating_range}: {stats['solved']}/{stats['total']} ({rate:.1f}%)")
         
@@ -497,6 +646,47 @@ class EnhancedPuzzleTester:
             os.remove(self.solved_puzzles_file)
         print("✅ Solved puzzles tracker reset")
 
+class _WorkerTester(EnhancedPuzzleTester):
+    """
+    Engine-only tester used inside run_test_session workers.
+    
+    Solved puzzles, results and the eval cache file belong to the parent process;
+    a worker only drives its engine and starts with an empty cache.
+    """
+    
+    def __init__(self, engine_path: str, csv_path: str):
+        self.engine_path = engine_path
+        self.csv_path = csv_path
+        self.engine_version = _engine_version(engine_path)
+        self.solved_puzzles = set()
+        self.eval_cache = {}
+        self.engine: Optional[subprocess.Popen] = None
+
+# Per-process tester owned by each run_test_session worker
+_worker_tester: Optional[_WorkerTester] = None
+
+def _init_worker(engine_path: str, csv_path: str):
+    """Create the worker's tester; its engine is closed when the worker exits."""
+    global _worker_tester
+    _worker_tester = _WorkerTester(engine_path, csv_path)
+    multiprocessing.util.Finalize(_worker_tester, _worker_tester.close, exitpriority=10)
+
+def _test_puzzle_worker(puzzle: Puzzle, time_limit: float, verbose: bool = True,
+                        cached: Optional[Dict] = None) -> Tuple[PuzzleSequenceResult, Dict]:
+    """
+    Test one puzzle on this worker's persistent engine.
+    
+    cached holds the parent's answers for this puzzle's positions; the answers
+    the engine had to compute are handed back for the parent's cache.
+    """
+    cached = cached or {}
+    _worker_tester.eval_cache = dict(cached)
+    result = _worker_tester.test_puzzle_sequence(puzzle, time_limit, verbose=verbose)
+    
+    cache_entries = {key: value for key, value in _worker_tester.eval_cache.items()
+                     if key not in cached}
+    return result, cache_entries
+
 def main():
     """Main test runner with your specified configuration."""
     # Configuration
@@ -511,8 +701,6 @@ def main():
         print(f"❌ Puzzle CSV not found: {csv_path}")
         return
     
-    tester = EnhancedPuzzleTester(engine_path, csv_path)
-    
     # Test configuration based on your requirements
     test_themes = [
         "mate",           # Mating patterns
@@ -530,12 +718,13 @@ def main():
     print("   - Time limit: 5 seconds per move")
     
     # Run test session
-    tester.run_test_session(
-        count=8,  # Start with 8 puzzles
-        rating_min=1200,
-        rating_max=1700,
-        themes_filter=test_themes
-    )
+    with EnhancedPuzzleTester(engine_path, csv_path) as tester:
+        tester.run_test_session(
+            count=8,  # Start with 8 puzzles
+            rating_min=1200,
+            rating_max=1700,
+            themes_filter=test_themes
+        )
 
 if __name__ == "__main__":
     main()
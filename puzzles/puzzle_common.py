@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Shared plumbing for the Cece puzzle testers
+Engine output pump and the persistent puzzle CSV index used by both testers
+"""
+
+import csv
+import os
+import pickle
+import queue
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict
+
+
+class StdoutPump(threading.Thread):
+    """Background reader that moves engine output lines onto a queue."""
+    
+    def __init__(self, stream, lines: queue.Queue):
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.lines = lines
+    
+    def run(self):
+        # Works on text and binary pipes alike; bytes are decoded leniently
+        readline = self.stream.readline
+        while True:
+            line = readline()
+            if not line:
+                break
+            if isinstance(line, bytes):
+                line = line.decode(errors="replace")
+            self.lines.put(line.strip())
+        self.lines.put(None)  # Engine closed its output
+
+
+def index_path(csv_path: str) -> str:
+    """Path of the index file kept next to a puzzle CSV."""
+    return str(Path(csv_path).with_suffix(".index"))
+
+
+def build_index(csv_path: str) -> Dict[str, Any]:
+    """
+    Scan the puzzle CSV once and record what the filters need for each row.
+    
+    Returns:
+        Dictionary with per-row ratings and byte offsets into the CSV,
+        plus the row numbers carrying each theme
+    """
+    index_file = index_path(csv_path)
+    print(f"📇 Building puzzle index: {index_file}")
+    ratings = array('i')
+    offsets = array('q')
+    theme_rows: Dict[bytes, array] = {}
+    
+    # Fields stay as bytes: only the rating and theme columns are looked at,
+    # so decoding whole rows would be wasted work on the full Lichess export
+    with open(csv_path, 'rb', buffering=1 << 20) as f:
+        offset = len(f.readline())  # Skip header
+        for line in f:
+            if b'"' in line:
+                fields = [field.encode('utf-8') for field in next(csv.reader([line.decode('utf-8')]))]
+            else:
+                fields = line.split(b',', 8)
+            
+            if len(fields) >= 8:
+                try:
+                    rating = int(fields[3])
+                except ValueError:
+                    rating = None
+                
+                if rating is not None:
+                    row = len(ratings)
+                    ratings.append(rating)
+                    offsets.append(offset)
+                    for theme in fields[7].split():
+                        rows = theme_rows.get(theme)
+                        if rows is None:
+                            rows = theme_rows[theme] = array('I')
+                        rows.append(row)
+            
+            offset += len(line)
+    
+    stat = os.stat(csv_path)
+    index = {
+        'source': (stat.st_size, stat.st_mtime),
+        'ratings': ratings,
+        'offsets': offsets,
+        'theme_rows': {theme.decode('utf-8'): rows for theme, rows in theme_rows.items()}
+    }
+    with open(index_file, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    print(f"   Indexed {len(ratings):,} puzzles")
+    return index
+
+
+def load_index(csv_path: str) -> Dict[str, Any]:
+    """Load the puzzle index, rebuilding it if the CSV changed since it was built."""
+    stat = os.stat(csv_path)
+    try:
+        with open(index_path(csv_path), 'rb') as f:
+            index = pickle.load(f)
+    except FileNotFoundError:
+        return build_index(csv_path)
+    if index.get('source') == (stat.st_size, stat.st_mtime):
+        return index
+    return build_index(csv_path)
@@ -7,36 +7,53 @@ Tests engine performance on tactical puzzles from Lichess database
 import csv
 import random
 import json
+import queue
 import subprocess
 import time
 import os
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from pathlib import Path
+import sys
+import multiprocessing.util
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from dataclasses import dataclass, asdict
 
-@dataclass
+from puzzle_common import StdoutPump, load_index
+
+# Slotted instances where dataclasses support it (3.10+); frozen either way
+_FROZEN = {'frozen': True, 'slots': True} if sys.version_info >= (3, 10) else {'frozen': True}
+
+@dataclass(**_FROZEN)
 class Puzzle:
     """Container for puzzle data."""
     puzzle_id: str
     fen: str
-    moves: List[str]  # Solution moves
+    moves: Tuple[str, ...]  # Solution moves
     rating: int
-    themes: List[str]
+    themes: FrozenSet[str]  # Set semantics: membership tests are O(1) and puzzles stay hashable
     opening_tags: str
     
     @classmethod
     def from_csv_row(cls, row: List[str]) -> 'Puzzle':
         """Create puzzle from CSV row."""
+        try:
+            rating = int(row[3])
+        except ValueError:
+            rating = 0
         return cls(
             puzzle_id=row[0],
             fen=row[1], 
-            moves=row[2].split(),
-            rating=int(row[3]) if row[3].isdigit() else 0,
-            themes=row[7].split(),
+            moves=tuple(row[2].split()),
+            rating=rating,
+            themes=frozenset(row[7].split()),
             opening_tags=row[9] if len(row) > 9 else ""
         )
 
-@dataclass 
+# Puzzles already parsed in this process, by (CSV path, CSV (size, mtime), byte
+# offset of their row); the CSV stamp keeps offsets from an older file from matching
+_puzzle_cache: Dict[Tuple[str, Tuple[int, float], int], Puzzle] = {}
+
+@dataclass(**_FROZEN)
 class PuzzleResult:
     """Container for puzzle test result."""
     puzzle_id: str
@@ -55,146 +72,184 @@ class PuzzleTester:
     def __init__(self, engine_path: str, csv_path: str):
         self.engine_path = engine_path
         self.csv_path = csv_path
-        self.solved_puzzles_file = "solved_puzzles.json"
-        self.results_file = "puzzle_results.json"
+        self.solved_puzzles_file = "solved_puzzles.txt"
+        self.results_file = "puzzle_results.jsonl"
         
         # Load previously solved puzzles
         self.solved_puzzles = self._load_solved_puzzles()
         self.results = self._load_results()
         
+        # Persistent engine process, started on first use and reused across puzzles
+        self.engine: Optional[subprocess.Popen] = None
+        self._lines: queue.Queue = queue.Queue()
+        
     def _load_solved_puzzles(self) -> set:
-        """Load set of previously solved puzzle IDs."""
-        if os.path.exists(self.solved_puzzles_file):
+        """Load set of previously solved puzzle IDs, one per line."""
+        try:
             with open(self.solved_puzzles_file, 'r') as f:
-                return set(json.load(f))
-        return set()
+                return set(f.read().split())
+        except FileNotFoundError:
+            return set()
     
-    def _save_solved_puzzles(self):
-        """Save solved puzzle IDs."""
-        with open(self.solved_puzzles_file, 'w') as f:
-            json.dump(list(self.solved_puzzles), f)
+    def _save_solved_puzzle(self, puzzle_id: str):
+        """Append a newly solved puzzle ID."""
+        with open(self.solved_puzzles_file, 'a') as f:
+            f.write(f"{puzzle_id}\n")
     
     def _load_results(self) -> List[PuzzleResult]:
-        """Load previous test results."""
-        if os.path.exists(self.results_file):
+        """Load previous test results, one JSON object per line."""
+        try:
             with open(self.results_file, 'r') as f:
-                data = json.load(f)
-                return [PuzzleResult(**item) for item in data]
-        return []
+                return [PuzzleResult(**json.loads(line)) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
     
-    def _save_results(self):
-        """Save test results."""
-        with open(self.results_file, 'w') as f:
-            json.dump([result.__dict__ for result in self.results], f, indent=2)
+    def _save_result(self, result: PuzzleResult):
+        """Append a single test result so finished puzzles survive an interrupted session."""
+        with open(self.results_file, 'a') as f:
+            f.write(json.dumps(asdict(result)) + "\n")
     
     def get_random_puzzles(self, count: int, 
                           rating_min: int = 1000, rating_max: int = 2000,
                           themes_filter: Optional[List[str]] = None) -> List[Puzzle]:
         """Get random puzzles matching criteria, excluding already solved ones."""
+        index = load_index(self.csv_path)
+        ratings = index['ratings']
+        
+        # Filter on the index columns only - no CSV parsing
+        if themes_filter:
+            rows = set()
+            for theme in frozenset(themes_filter):
+                rows.update(index['theme_rows'].get(theme, ()))
+            candidates = [row for row in rows if rating_min <= ratings[row] <= rating_max]
+        else:
+            candidates = [row for row, rating in enumerate(ratings) if rating_min <= rating <= rating_max]
+        
+        # Materialize only the randomly chosen rows, skipping solved puzzles
+        random.shuffle(candidates)
         puzzles = []
         seen_ids = set()
-        
-        # Read CSV and collect matching puzzles
-        with open(self.csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            
-            for row in reader:
-                if len(row) < 8:
-                    continue
-                    
-                puzzle_id = row[0]
-                if puzzle_id in self.solved_puzzles or puzzle_id in seen_ids:
-                    continue
-                    
-                # Check rating
-                try:
-                    rating = int(row[3])
-                    if not (rating_min <= rating <= rating_max):
-                        continue
-                except (ValueError, IndexError):
+        with open(self.csv_path, 'rb') as f:
+            for row in candidates:
+                if len(puzzles) >= count:
+                    break
+                offset = index['offsets'][row]
+                key = (self.csv_path, index['source'], offset)
+                puzzle = _puzzle_cache.get(key)
+                if puzzle is None:
+                    f.seek(offset)
+                    puzzle = Puzzle.from_csv_row(next(csv.reader([f.readline().decode('utf-8')])))
+                    _puzzle_cache[key] = puzzle
+                if puzzle.puzzle_id in self.solved_puzzles or puzzle.puzzle_id in seen_ids:
                     continue
-                
-                # Check themes filter
-                if themes_filter:
-                    puzzle_themes = row[7].split()
-                    if not any(theme in puzzle_themes for theme in themes_filter):
-                        continue
-                
-                puzzle = Puzzle.from_csv_row(row)
                 puzzles.append(puzzle)
-                seen_ids.add(puzzle_id)
-                
-                # Stop if we have enough candidates
-                if len(puzzles) >= count * 10:  # Get 10x more for random selection
-                    break
+                seen_ids.add(puzzle.puzzle_id)
         
-        # Return random sample
-        return random.sample(puzzles, min(count, len(puzzles)))
+        return puzzles
+    
+    def __enter__(self) -> 'PuzzleTester':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _start_engine(self):
+        """Start the engine process and complete the UCI handshake."""
+        self.engine = subprocess.Popen(
+            self.engine_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # One pipe to drain, so stderr can never fill up
+            text=True,
+            bufsize=1
+        )
+        assert self.engine.stdin is not None and self.engine.stdout is not None  # Both are PIPEs
+        
+        # Reader thread feeds a queue, so waits can time out even when the
+        # engine goes silent instead of blocking in readline()
+        self._lines = queue.Queue()
+        StdoutPump(self.engine.stdout, self._lines).start()
+        
+        self._send("uci")
+        self._read_until(lambda line: line == "uciok", 2)
+        self._send("isready")
+        self._read_until(lambda line: line == "readyok", 2)
+    
+    def _send(self, cmd: str):
+        """Send a single UCI command to the engine."""
+        self.engine.stdin.write(f"{cmd}\n")
+        self.engine.stdin.flush()
+    
+    def _read_until(self, pred: Callable[[str], bool], timeout: float) -> List[str]:
+        """
+        Read engine output lines until one satisfies pred or the timeout expires.
+        
+        Returns:
+            All lines read, ending with the matching line unless the timeout expired
+        """
+        lines = []
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                break  # Engine exited
+            lines.append(line)
+            if pred(line):
+                break
+        return lines
+    
+    def close(self):
+        """Send quit to the engine process and wait for it to exit."""
+        if self.engine is None:
+            return
+        try:
+            if self.engine.poll() is None:
+                self._send("quit")
+                self.engine.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.engine.kill()
+            self.engine.wait()
+        self.engine = None
     
     def test_puzzle(self, puzzle: Puzzle, time_limit: float = 3.0) -> PuzzleResult:
         """Test engine on a single puzzle."""
         print(f"Testing puzzle {puzzle.puzzle_id} (Rating: {puzzle.rating})")
-        print(f"Themes: {' '.join(puzzle.themes)}")
+        print(f"Themes: {' '.join(sorted(puzzle.themes))}")
         print(f"Position: {puzzle.fen}")
         print(f"Expected move: {puzzle.moves[0]}")
         
         try:
-            # Start engine
-            engine = subprocess.Popen(
-                self.engine_path,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0
-            )
+            if self.engine is None or self.engine.poll() is not None:
+                self._start_engine()
             
-            start_time = time.time()
+            start_time = time.monotonic()
             
-            # Send UCI commands
-            commands = [
-                "uci",
-                "isready",
-                f"position fen {puzzle.fen}",
-                f"go movetime {int(time_limit * 1000)}"  # Convert to milliseconds
-            ]
+            # Fresh game on the already-initialized engine, synced with isready
+            # so nothing left over from the previous puzzle is read as its answer
+            self._send("ucinewgame")
+            self._send(f"position fen {puzzle.fen}")
+            self._send("isready")
+            self._read_until(lambda line: line == "readyok", 5)
             
-            for cmd in commands:
-                if engine.stdin:
-                    engine.stdin.write(f"{cmd}\n")
-                    engine.stdin.flush()
-                if cmd == "uci":
-                    time.sleep(0.5)  # Wait for UCI response
+            self._send(f"go movetime {int(time_limit * 1000)}")  # Convert to milliseconds
+            output_lines = self._read_until(lambda line: line.startswith("bestmove"), time_limit + 2)
             
-            # Read output until we get bestmove
+            # Read the engine's answer
             engine_move = None
-            output_lines = []
-            
-            while True:
-                if not engine.stdout:
-                    break
-                line = engine.stdout.readline()
-                if not line:
-                    break
-                line = line.strip()
-                output_lines.append(line)
-                
-                if line.startswith("bestmove"):
-                    engine_move = line.split()[1] if len(line.split()) > 1 else "0000"
-                    break
-                    
-                # Timeout check
-                if time.time() - start_time > time_limit + 2:
-                    break
-            
-            # Clean up
-            if engine.stdin:
-                engine.stdin.write("quit\n")
-                engine.stdin.flush()
-            engine.wait(timeout=2)
+            if output_lines and output_lines[-1].startswith("bestmove"):
+                parts = output_lines[-1].split()
+                engine_move = parts[1] if len(parts) > 1 else "0000"
+            else:
+                # Engine is still searching; restart it for the next puzzle
+                self.close()
             
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             
             # Check if solved
             solved = engine_move == puzzle.moves[0]
@@ -206,7 +261,7 @@ class PuzzleTester:
                 expected_move=puzzle.moves[0],
                 time_taken=elapsed,
                 search_depth=0,  # TODO: extract from engine output
-                themes=puzzle.themes,
+                themes=sorted(puzzle.themes),
                 rating=puzzle.rating,
                 notes=f"Output lines: {len(output_lines)}"
             )
@@ -219,6 +274,7 @@ class PuzzleTester:
             return result
             
         except Exception as e:
+            self.close()
             return PuzzleResult(
                 puzzle_id=puzzle.puzzle_id,
                 solved=False,
@@ -226,13 +282,18 @@ class PuzzleTester:
                 expected_move=puzzle.moves[0],
                 time_taken=0,
                 search_depth=0,
-                themes=puzzle.themes,
+                themes=sorted(puzzle.themes),
                 rating=puzzle.rating,
                 notes=f"Error: {str(e)}"
             )
     
-    def run_test_session(self, count: int = 10, **kwargs):
-        """Run a test session on random puzzles."""
+    def run_test_session(self, count: int = 10, max_engines: Optional[int] = None, **kwargs):
+        """
+        Run a test session on random puzzles, one engine process per worker.
+        
+        max_engines caps how many engines search at once; by default half the
+        CPU count is used.
+        """
         print(f"🧩 Starting puzzle test session ({count} puzzles)")
         print("=" * 60)
         
@@ -242,47 +303,79 @@ class PuzzleTester:
         session_results = []
         solved_count = 0
         
-        for i, puzzle in enumerate(puzzles, 1):
-            print(f"\\n[{i}/{len(puzzles)}] ", end="")
-            result = self.test_puzzle(puzzle)
-            session_results.append(result)
-            self.results.append(result)
-            
-            if result.solved:
-                solved_count += 1
-                self.solved_puzzles.add(puzzle.puzzle_id)
-        
-        # Save progress
-        self._save_solved_puzzles()
-        self._save_results()
+        if max_engines is None:
+            max_engines = (os.cpu_count() or 2) // 2
+        workers = max(1, min(len(puzzles), max_engines))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.engine_path, self.csv_path)) as executor:
+            futures = [executor.submit(_test_puzzle_worker, puzzle) for puzzle in puzzles]
+            for i, future in enumerate(as_completed(futures), 1):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{i}/{len(puzzles)}] ❌ Worker error: {e}")
+                    continue
+                
+                print(f"[{i}/{len(puzzles)}] Finished puzzle {result.puzzle_id}")
+                session_results.append(result)
+                self.results.append(result)
+                self._save_result(result)
+                
+                if result.solved:
+                    solved_count += 1
+                    if result.puzzle_id not in self.solved_puzzles:
+                        self.solved_puzzles.add(result.puzzle_id)
+                        self._save_solved_puzzle(result.puzzle_id)
         
         # Print session summary
         print(f"\\n🎯 Session Summary:")
         print(f"Puzzles solved: {solved_count}/{len(puzzles)} ({solved_count/len(puzzles)*100:.1f}%)")
         
         # Theme analysis
-        theme_stats = {}
+        theme_totals = Counter()
+        theme_solved = Counter()
         for result in session_results:
-            for theme in result.themes:
-                if theme not in theme_stats:
-                    theme_stats[theme] = {'total': 0, 'solved': 0}
-                theme_stats[theme]['total'] += 1
-                if result.solved:
-                    theme_stats[theme]['solved'] += 1
+            theme_totals.update(result.themes)
+            if result.solved:
+                theme_solved.update(result.themes)
         
         print("\\n📊 Theme Performance:")
-        for theme, stats in sorted(theme_stats.items()):
-            if stats['total'] >= 2:  # Only show themes with 2+ puzzles
-                rate = stats['solved'] / stats['total'] * 100
-                print(f"  {theme}: {stats['solved']}/{stats['total']} ({rate:.1f}%)")
+        for theme, total in sorted(theme_totals.items()):
+            if total >= 2:  # Only show themes with 2+ puzzles
+                rate = theme_solved[theme] / total * 100
+                print(f"  {theme}: {theme_solved[theme]}/{total} ({rate:.1f}%)")
     
     def reset_solved_puzzles(self):
         """Reset the solved puzzles tracker."""
         self.solved_puzzles.clear()
-        if os.path.exists(self.solved_puzzles_file):
+        try:
             os.remove(self.solved_puzzles_file)
+        except FileNotFoundError:
+            pass
         print("✅ Solved puzzles tracker reset")
 
+class _WorkerTester(PuzzleTester):
+    """Engine-only tester for run_test_session workers; history files stay with the parent."""
+    
+    def __init__(self, engine_path: str, csv_path: str):
+        self.engine_path = engine_path
+        self.csv_path = csv_path
+        self.engine: Optional[subprocess.Popen] = None
+        self._lines: queue.Queue = queue.Queue()
+
+# Per-process tester owned by each run_test_session worker
+_worker_tester: Optional[_WorkerTester] = None
+
+def _init_worker(engine_path: str, csv_path: str):
+    """Create the worker's tester; its engine is closed when the worker exits."""
+    global _worker_tester
+    _worker_tester = _WorkerTester(engine_path, csv_path)
+    multiprocessing.util.Finalize(_worker_tester, _worker_tester.close, exitpriority=10)
+
+def _test_puzzle_worker(puzzle: Puzzle) -> PuzzleResult:
+    """Test one puzzle on this worker's persistent engine."""
+    return _worker_tester.test_puzzle(puzzle)
+
 def main():
     """Main test runner."""
     # Configuration
@@ -297,15 +390,14 @@ def main():
         print(f"❌ Puzzle CSV not found: {csv_path}")
         return
     
-    tester = PuzzleTester(engine_path, csv_path)
-    
-    # Run test session
-    tester.run_test_session(
-        count=5,  # Start with 5 puzzles
-        rating_min=1200,
-        rating_max=1600,
-        themes_filter=["advantage", "mate"]  # Focus on basic themes
-    )
+    with PuzzleTester(engine_path, csv_path) as tester:
+        # Run test session
+        tester.run_test_session(
+            count=5,  # Start with 5 puzzles
+            rating_min=1200,
+            rating_max=1600,
+            themes_filter=["advantage", "mate"]  # Focus on basic themes
+        )
 
 if __name__ == "__main__":
     main()
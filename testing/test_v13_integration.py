@@ -3,84 +3,115 @@
 Quick integration test for v1.3 evaluation improvements.
 """
 
+import io
 import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+
+
+def _note(text):
+    """Print a progress line; 'python -O' drops these and keeps only OK:/FAIL: results."""
+    if __debug__:
+        print(text)
 
 def test_evaluation():
     """Test the v1.3 evaluation system."""
-    print("🔬 Testing v1.3 Evaluation Integration")
-    print("=" * 40)
+    if __debug__:
+        print("== Testing v1.3 Evaluation Integration")
+        print("=" * 40)
     
     try:
         # Test imports
         import chess
-        print("✓ Chess module imported")
-        
-        from evaluation import Evaluation
-        print("✓ Evaluation module imported")
+        _note("+ Chess module imported")
         
         # Test evaluation creation
+        from evaluation import Evaluation
         eval_obj = Evaluation()
-        print("✓ Evaluation object created")
+        _note("+ Evaluation module imported")
+        _note("+ Evaluation object created")
         
         # Test basic evaluation
         board = chess.Board()
         score = eval_obj.evaluate(board)
-        print(f"✓ Starting position score: {score}")
+        _note(f"+ Starting position score: {score}")
         
         # Test bad knight move (should be penalized by opening knight table)
-        board.push_san('Nh3')
+        board.push(chess.Move(chess.G1, chess.H3))  # Nh3
         score_after_nh3 = eval_obj.evaluate(board)
-        print(f"✓ After Nh3 score: {score_after_nh3}")
-        print(f"  Change: {score_after_nh3 - score} (should be negative)")
+        _note(f"+ After Nh3 score: {score_after_nh3}")
+        _note(f"  Change: {score_after_nh3 - score} (should be negative)")
         
         # Test detailed evaluation
         detailed = eval_obj.evaluate_detailed(board)
-        print(f"✓ Detailed evaluation keys: {list(detailed.keys())}")
+        _note(f"+ Detailed evaluation keys: {list(detailed.keys())}")
         
-        print("\n🎉 v1.3 evaluation integration successful!")
+        print("\nOK: v1.3 evaluation integration successful!")
         return True
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"FAIL: {e}")
         traceback.print_exc()
         return False
 
 def test_engine():
     """Test the v1.3 engine integration."""
-    print("\n🚀 Testing v1.3 Engine Integration")
-    print("=" * 40)
+    if __debug__:
+        print("\n== Testing v1.3 Engine Integration")
+        print("=" * 40)
     
     try:
         from engine import ChessEngine
-        print("✓ Engine module imported")
+        _note("+ Engine module imported")
         
         engine = ChessEngine()
-        print(f"✓ Engine created: {engine.info['name']} v{engine.info['version']}")
+        _note(f"+ Engine created: {engine.info['name']} v{engine.info['version']}")
         
         # Test basic move search
         engine.set_position()
-        print("✓ Position set to starting position")
+        _note("+ Position set to starting position")
         
         # Test analysis
         analysis = engine.analyze_position()
-        print(f"✓ Position analysis completed")
+        _note(f"+ Position analysis completed")
         
-        print("\n🎉 v1.3 engine integration successful!")
+        print("\nOK: v1.3 engine integration successful!")
         return True
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"FAIL: {e}")
         traceback.print_exc()
         return False
 
+def _run_captured(test):
+    """Run one test in a worker process; return (success, everything it printed)."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        try:
+            success = test()
+        except Exception:
+            traceback.print_exc()
+            success = False
+    return success, buffer.getvalue()
+
+def run_tests_parallel():
+    """Run both tests in separate processes, printing their output in submission order."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        outcomes = list(executor.map(_run_captured, (test_evaluation, test_engine)))
+    
+    results = []
+    for success, output in outcomes:
+        sys.stdout.write(output)
+        results.append(success)
+    return results
+
 if __name__ == "__main__":
-    eval_success = test_evaluation()
-    engine_success = test_engine()
+    eval_success, engine_success = run_tests_parallel()
     
     if eval_success and engine_success:
-        print("\n🏆 All v1.3 integration tests passed!")
+        print("\nOK: All v1.3 integration tests passed!")
         sys.exit(0)
     else:
-        print("\n💥 Some tests failed!")
+        print("\nFAIL: Some tests failed!")
         sys.exit(1)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+UCI protocol test for v1.3: 'stop' straight after 'go' must still yield a real move.
+"""
+
+import os
+import subprocess
+import sys
+
+import chess
+
+# uci_interface.py lives in the repository root, one level above this file
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_go_then_immediate_stop():
+    """A search stopped before depth 1 completes must not answer 'bestmove 0000'."""
+    print("🔬 Testing go followed by an immediate stop")
+    print("=" * 40)
+
+    commands = "uci\nisready\nposition startpos moves e2e4\ngo depth 5\nstop\nquit\n"
+    process = subprocess.run(
+        [sys.executable, "uci_interface.py"],
+        cwd=ROOT_DIR,
+        input=commands,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+    bestmoves = [line.split()[1] for line in process.stdout.splitlines()
+                 if line.startswith("bestmove")]
+    print(f"✓ Engine replied: {bestmoves}")
+
+    assert len(bestmoves) == 1, f"expected one bestmove, got {bestmoves}"
+    board = chess.Board()
+    board.push_uci("e2e4")
+    assert chess.Move.from_uci(bestmoves[0]) in board.legal_moves, \
+        f"bestmove {bestmoves[0]} is not a legal reply to 1.e4"
+
+    print("\nOK: stop returned a legal move")
+
+
+if __name__ == "__main__":
+    test_go_then_immediate_stop()
@@ -9,10 +9,58 @@ import chess
 import chess.pgn
 import io
 import json
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from collections import Counter, deque
+
+# Marker for games Cece v1.3 played in
+_CECE_TOKEN = b'Cece_v1.3'
+
+# Games handed to each process-pool task in extract_cece_games
+_PARSE_BATCH_SIZE = 64
+
+# Batches kept submitted per worker, so decoded game text in memory stays bounded
+_PARSE_BATCHES_PER_WORKER = 2
+
+# PGN tag pair, e.g. [White "Cece_v1.3"]
+_TAG_RE = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+
+# The tags _parse_game reads, matched on a game's raw header bytes
+_HEADER_SCAN = re.compile(rb'\[(White|Black|Result|Termination|PlyCount|Opening)\s+"([^"]*)"\]')
+
+# Movetext tokens that are not moves
+_COMMENT_RE = re.compile(r'\{[^}]*\}')
+_NAG_RE = re.compile(r'\$\d+')
+_MOVENUM_RE = re.compile(r'\d+\.(?:\.\.)?')
+_RESULT_RE = re.compile(r'1-0|0-1|1/2-1/2|\*')
+
+# Opening move classes for pattern analysis
+_BAD_OPENINGS = frozenset({'Nh3', 'Na3', 'h3', 'a3', 'h4', 'a4'})
+_GOOD_OPENINGS = frozenset({'Nf3', 'Nc3', 'e4', 'd4', 'Nf6', 'Nc6', 'e5', 'd5'})
+_RIM_KNIGHT_MOVES = {
+    'white': frozenset({'Nh3', 'Na3', 'Ng5', 'Ne2'}),
+    'black': frozenset({'Nh6', 'Na6', 'Ng4', 'Ne7'})
+}
+
+# Pattern types that flag a poor opening or development choice
+_BAD_PATTERN_TYPES = frozenset({'BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT'})
+
+# Stats field counted for each cece_result
+_RESULT_FIELDS = {'win': 'wins', 'loss': 'losses', 'draw': 'draws'}
+
+# Report sections also written to the small summary file read by the web preview
+_SUMMARY_SECTIONS = ('metadata', 'tournament_summary', 'insights_and_recommendations',
+                     'visualization_data')
+
+def format_pattern(pattern_type: str, detail: str) -> str:
+    """Render a (pattern type, detail) pair for display, e.g. 'BAD_OPENING: Nh3'."""
+    return f"{pattern_type}: {detail}"
 
 @dataclass
 class GameResult:
@@ -25,11 +73,82 @@ class GameResult:
     plycount: int
     opening: str
     cece_color: str
+    opponent: str
     cece_result: str  # 'win', 'loss', 'draw'
     moves: List[str]
-    key_patterns: List[str]
+    key_patterns: List[Tuple[str, str]]  # (pattern type, detail)
     eval_available: bool
 
+def _iter_games(f, token: Optional[bytes] = None):
+    """Yield the raw bytes of each game in binary PGN file f, one game at a time.
+    
+    The file is memory-mapped and scanned for game boundaries in place; a new
+    game starts at an [Event line that follows a blank line. If token is given,
+    only games containing it are copied out of the mapping and yielded.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if not size:
+        return  # mmap cannot map an empty file
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        pos = 0
+        while True:
+            idx = mm.find(b'\n[Event', pos)
+            if idx < 0:
+                end = size
+            else:
+                pos = idx + 1
+                # Only a game boundary if the line before [Event is blank (LF or CRLF)
+                if mm[idx - 1:idx] != b'\n' and mm[idx - 2:idx] != b'\n\r':
+                    continue
+                end = idx + 1
+            if token is None or mm.find(token, start, end) >= 0:
+                yield mm[start:end]
+            if idx < 0:
+                return
+            start = end
+
+def _encode_report(value: Any, indent: str = '') -> str:
+    """Encode a report section as indented JSON with each record on one line.
+    
+    The report's schema is fixed: objects nest a few levels deep and end in
+    lists of per-game records. Objects are laid out with indent=2 as before,
+    but a list of records is written one compact record per line, because
+    json's C encoder only handles unindented output and with indent=2 every
+    move and pattern of every game would be a line of its own.
+    """
+    inner = indent + '  '
+    if isinstance(value, dict) and value:
+        return '{\n' + ',\n'.join(
+            f'{inner}{json.dumps(key, ensure_ascii=False)}: {_encode_report(item, inner)}'
+            for key, item in value.items()
+        ) + '\n' + indent + '}'
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return '[\n' + ',\n'.join(
+            inner + json.dumps(item, ensure_ascii=False) for item in value
+        ) + '\n' + indent + ']'
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + indent)
+
+def _write_analysis_json(f, analysis_data: Dict[str, Any]):
+    """Write analysis_data to f as JSON, encoding and writing one top-level section at a time."""
+    f.write('{')
+    for i, (key, value) in enumerate(analysis_data.items()):
+        f.write(',\n  ' if i else '\n  ')
+        f.write(json.dumps(key))
+        f.write(': ')
+        f.write(_encode_report(value, '  '))
+    f.write('\n}' if analysis_data else '}')
+
+def summary_json_path(output_path: str) -> str:
+    """Path of the summary file written next to a full analysis report."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_summary{ext or '.json'}"
+
+def _parse_game_batch(batch: List[Tuple[str, int, Dict[str, str]]]) -> List[Optional[GameResult]]:
+    """Process-pool entry point: parse a batch of (game_text, game_number, tags) entries."""
+    parser = TournamentAnalyzer('')
+    return [parser._parse_game(game_text, game_number, tags) for game_text, game_number, tags in batch]
+
 class TournamentAnalyzer:
     """Analyze tournament results for Cece v1.3 performance."""
     
@@ -37,61 +156,97 @@ class TournamentAnalyzer:
         self.pgn_file_path = pgn_file_path
         self.games: List[GameResult] = []
         self.cece_games: List[GameResult] = []
+        self._aggregates: Optional[Dict[str, Any]] = None
+        self._columns: Optional[Dict[str, Any]] = None
+        self._summary_cache: Optional[Dict[str, Any]] = None
         
-    def extract_cece_games(self) -> List[GameResult]:
-        """Extract all games where Cece v1.3 played."""
-        print("🔍 Extracting Cece v1.3 games from tournament...")
-        
-        with open(self.pgn_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def extract_cece_games(self, max_workers: int = 1) -> List[GameResult]:
+        """Extract all games where Cece v1.3 played.
         
-        # Split into individual games
-        games_text = content.split('\n\n[Event')
+        With max_workers > 1 the games are parsed in a process pool, which
+        only pays off for tournaments with thousands of games.
+        """
+        print("🔍 Extracting Cece v1.3 games from tournament...")
         
         cece_games = []
-        game_number = 0
         
-        for i, game_text in enumerate(games_text):
-            if i > 0:  # Add back the [Event tag for all but first game
-                game_text = '[Event' + game_text
-            
-            # Check if Cece v1.3 is in this game
-            if 'Cece_v1.3' not in game_text:
-                continue
-                
-            game_number += 1
-            game_result = self._parse_game(game_text, game_number)
-            if game_result:
-                cece_games.append(game_result)
+        # Stream the file one game at a time instead of reading it whole
+        with open(self.pgn_file_path, 'rb') as f:
+            numbered_games = self._iter_cece_game_texts(f)
+            if max_workers > 1:
+                batches = iter(lambda: list(islice(numbered_games, _PARSE_BATCH_SIZE)), [])
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    # executor.map would submit every batch up front; keep a
+                    # window of futures instead and collect them in file order
+                    in_flight = deque(executor.submit(_parse_game_batch, batch) for batch in
+                                      islice(batches, max_workers * _PARSE_BATCHES_PER_WORKER))
+                    while in_flight:
+                        results = in_flight.popleft().result()
+                        for batch in islice(batches, 1):
+                            in_flight.append(executor.submit(_parse_game_batch, batch))
+                        cece_games.extend(result for result in results if result)
+            else:
+                for game_text, game_number, tags in numbered_games:
+                    game_result = self._parse_game(game_text, game_number, tags)
+                    if game_result:
+                        cece_games.append(game_result)
                 
         self.cece_games = cece_games
+        self._aggregates = None
+        self._columns = None
+        self._summary_cache = None
         print(f"✅ Found {len(cece_games)} games with Cece v1.3")
         return cece_games
     
-    def _parse_game(self, game_text: str, game_number: int) -> Optional[GameResult]:
-        """Parse a single game from PGN text."""
+    @staticmethod
+    def _iter_cece_game_texts(f):
+        """Yield (game_text, game_number, tags) for each game in f that Cece v1.3 played.
+        
+        The header tags are read in one scan of the raw bytes, and games where
+        Cece is neither White nor Black are skipped before anything is decoded.
+        """
+        game_number = 0
+        for game_bytes in _iter_games(f, _CECE_TOKEN):
+            game_bytes = game_bytes.replace(b'\r\n', b'\n')
+            header_end = game_bytes.find(b'\n\n')
+            if header_end < 0:
+                header_end = len(game_bytes)
+            raw_tags = dict(_HEADER_SCAN.findall(game_bytes, 0, header_end))
+            if _CECE_TOKEN not in (raw_tags.get(b'White'), raw_tags.get(b'Black')):
+                continue
+            
+            # Arena may write non-UTF-8 names; keep going with replacement characters
+            tags = {name.decode('ascii'): value.decode('utf-8', errors='replace')
+                    for name, value in raw_tags.items()}
+            game_number += 1
+            yield game_bytes.decode('utf-8', errors='replace'), game_number, tags
+    
+    def _parse_game(self, game_text: str, game_number: int,
+                    tags: Optional[Dict[str, str]] = None) -> Optional[GameResult]:
+        """Parse a single game from PGN text, reusing its header tags if already scanned."""
         try:
-            # Parse headers
-            white_match = re.search(r'\[White "([^"]+)"\]', game_text)
-            black_match = re.search(r'\[Black "([^"]+)"\]', game_text)
-            result_match = re.search(r'\[Result "([^"]+)"\]', game_text)
-            termination_match = re.search(r'\[Termination "([^"]+)"\]', game_text)
-            plycount_match = re.search(r'\[PlyCount "([^"]+)"\]', game_text)
-            opening_match = re.search(r'\[Opening "([^"]+)"\]', game_text)
+            if tags is None:
+                # Parse headers in one scan that stops at the blank line ending the tag section
+                header_end = game_text.find('\n\n')
+                if header_end < 0:
+                    header_end = len(game_text)
+                tags = dict(_TAG_RE.findall(game_text, 0, header_end))
+            
+            white = tags.get('White')
+            black = tags.get('Black')
+            result = tags.get('Result')
             
-            if not white_match or not black_match or not result_match:
+            if not white or not black or not result:
                 return None
                 
-            white = white_match.group(1)
-            black = black_match.group(1)
-            result = result_match.group(1)
-            termination = termination_match.group(1) if termination_match else "unknown"
-            plycount = int(plycount_match.group(1)) if plycount_match else 0
-            opening = opening_match.group(1) if opening_match else "Unknown"
+            termination = tags.get('Termination') or "unknown"
+            plycount = int(tags['PlyCount']) if tags.get('PlyCount') else 0
+            opening = tags.get('Opening') or "Unknown"
             
             # Determine Cece's color and result
             if white == "Cece_v1.3":
                 cece_color = "white"
+                opponent = black
                 if result == "1-0":
                     cece_result = "win"
                 elif result == "0-1":
@@ -100,6 +255,7 @@ class TournamentAnalyzer:
                     cece_result = "draw"
             elif black == "Cece_v1.3":
                 cece_color = "black"
+                opponent = white
                 if result == "0-1":
                     cece_result = "win"
                 elif result == "1-0":
@@ -127,6 +283,7 @@ class TournamentAnalyzer:
                 plycount=plycount,
                 opening=opening,
                 cece_color=cece_color,
+                opponent=opponent,
                 cece_result=cece_result,
                 moves=moves,
                 key_patterns=patterns,
@@ -139,26 +296,21 @@ class TournamentAnalyzer:
     
     def _extract_moves(self, game_text: str) -> List[str]:
         """Extract move list from game text."""
-        # Find the moves section (after headers, before result)
-        lines = game_text.split('\\n')
-        moves_started = False
-        moves_text = ""
-        
-        for line in lines:
-            if line.strip() and not line.startswith('['):
-                moves_started = True
-            if moves_started:
-                moves_text += line + " "
+        # The movetext follows the blank line that ends the tag section
+        header_end = game_text.find('\n\n')
+        if header_end < 0:
+            return []
+        moves_text = game_text[header_end + 2:]
         
         # Clean up and extract moves
-        moves_text = re.sub(r'\\{[^}]*\\}', '', moves_text)  # Remove comments
-        moves_text = re.sub(r'\\d+\\.', '', moves_text)      # Remove move numbers
-        moves_text = re.sub(r'[01]\/[2]\\-[01]|\\*', '', moves_text)  # Remove results
+        moves_text = _COMMENT_RE.sub(' ', moves_text)   # Remove comments
+        moves_text = _NAG_RE.sub(' ', moves_text)       # Remove NAGs
+        moves_text = _MOVENUM_RE.sub(' ', moves_text)   # Remove move numbers
+        moves_text = _RESULT_RE.sub(' ', moves_text)    # Remove results
         
-        moves = [move.strip() for move in moves_text.split() if move.strip()]
-        return moves
+        return moves_text.split()
     
-    def _analyze_patterns(self, moves: List[str], cece_color: str) -> List[str]:
+    def _analyze_patterns(self, moves: List[str], cece_color: str) -> List[Tuple[str, str]]:
         """Analyze move patterns for Cece v1.3."""
         patterns = []
         
@@ -178,99 +330,154 @@ class TournamentAnalyzer:
             first_move = cece_moves[0]
             
             # Check for bad opening moves (v1.3 should avoid these)
-            if first_move in ['Nh3', 'Na3', 'h3', 'a3', 'h4', 'a4']:
-                patterns.append(f"BAD_OPENING: {first_move}")
-            elif first_move in ['Nf3', 'Nc3', 'e4', 'd4', 'Nf6', 'Nc6', 'e5', 'd5']:
-                patterns.append(f"GOOD_OPENING: {first_move}")
-            
-            # Check for early queen development
-            for i, move in enumerate(cece_moves[:4]):  # First 4 moves
-                if move.startswith('Q') and i < 3:
-                    patterns.append(f"EARLY_QUEEN: {move} on move {i+1}")
+            if first_move in _BAD_OPENINGS:
+                patterns.append(('BAD_OPENING', first_move))
+            elif first_move in _GOOD_OPENINGS:
+                patterns.append(('GOOD_OPENING', first_move))
             
-            # Check for knight development to rim
-            for i, move in enumerate(cece_moves[:6]):  # First 6 moves  
-                if move in ['Nh3', 'Na3', 'Ng5', 'Ne2'] and cece_color == "white":
-                    patterns.append(f"RIM_KNIGHT: {move} on move {i+1}")
-                elif move in ['Nh6', 'Na6', 'Ng4', 'Ne7'] and cece_color == "black":
-                    patterns.append(f"RIM_KNIGHT: {move} on move {i+1}")
+            # Check for early queen development (first 3 moves)
+            for i in range(min(3, len(cece_moves))):
+                move = cece_moves[i]
+                if move.startswith('Q'):
+                    patterns.append(('EARLY_QUEEN', f"{move} on move {i+1}"))
             
-            # Check for repetitive moves
-            move_counts = defaultdict(int)
-            for move in cece_moves:
-                move_counts[move] += 1
+            # Check for knight development to rim (first 6 moves)
+            rim_moves = _RIM_KNIGHT_MOVES[cece_color]
+            for i in range(min(6, len(cece_moves))):
+                move = cece_moves[i]
+                if move in rim_moves:
+                    patterns.append(('RIM_KNIGHT', f"{move} on move {i+1}"))
             
-            for move, count in move_counts.items():
-                if count >= 3:
-                    patterns.append(f"REPETITIVE: {move} played {count} times")
+            # Check for repetitive moves (most repeated first)
+            for move, count in Counter(cece_moves).most_common():
+                if count < 3:
+                    break
+                patterns.append(('REPETITIVE', f"{move} played {count} times"))
         
         return patterns
     
     def generate_summary(self) -> Dict[str, Any]:
-        """Generate tournament summary for Cece v1.3."""
+        """Generate tournament summary for Cece v1.3.
+        
+        The summary is cached until extract_cece_games runs again, since
+        main, export_to_json, generate_insights and prepare_visualization_data
+        all ask for it.
+        """
         if not self.cece_games:
             return {}
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
+        aggregates = self._compute_aggregates()
+        outcomes = aggregates['outcomes']
         
         total_games = len(self.cece_games)
-        wins = sum(1 for g in self.cece_games if g.cece_result == "win")
-        losses = sum(1 for g in self.cece_games if g.cece_result == "loss")
-        draws = sum(1 for g in self.cece_games if g.cece_result == "draw")
+        wins = outcomes['white', 'win'] + outcomes['black', 'win']
+        losses = outcomes['white', 'loss'] + outcomes['black', 'loss']
+        draws = outcomes['white', 'draw'] + outcomes['black', 'draw']
         
         # Analyze by color
-        white_games = [g for g in self.cece_games if g.cece_color == "white"]
-        black_games = [g for g in self.cece_games if g.cece_color == "black"]
+        white_games = aggregates['color_games']['white']
+        black_games = aggregates['color_games']['black']
         
-        white_wins = sum(1 for g in white_games if g.cece_result == "win")
-        black_wins = sum(1 for g in black_games if g.cece_result == "win")
-        
-        # Pattern analysis
-        all_patterns = []
-        for game in self.cece_games:
-            all_patterns.extend(game.key_patterns)
+        white_wins = outcomes['white', 'win']
+        black_wins = outcomes['black', 'win']
         
-        pattern_counts = defaultdict(int)
-        for pattern in all_patterns:
-            pattern_type = pattern.split(':')[0]
-            pattern_counts[pattern_type] += 1
+        # Pattern and termination analysis
+        pattern_counts = aggregates['pattern_counts']
+        termination_counts = aggregates['termination_counts']
         
-        # Termination analysis
-        termination_counts = defaultdict(int)
-        for game in self.cece_games:
-            termination_counts[game.termination] += 1
-        
-        return {
+        self._summary_cache = {
             'total_games': total_games,
             'wins': wins,
             'losses': losses,
             'draws': draws,
             'win_rate': wins / total_games if total_games > 0 else 0,
-            'white_games': len(white_games),
-            'black_games': len(black_games),
+            'white_games': white_games,
+            'black_games': black_games,
             'white_wins': white_wins,
             'black_wins': black_wins,
-            'white_win_rate': white_wins / len(white_games) if white_games else 0,
-            'black_win_rate': black_wins / len(black_games) if black_games else 0,
+            'white_win_rate': white_wins / white_games if white_games else 0,
+            'black_win_rate': black_wins / black_games if black_games else 0,
             'pattern_counts': dict(pattern_counts),
             'termination_counts': dict(termination_counts),
-            'eval_available_count': sum(1 for g in self.cece_games if g.eval_available)
+            'eval_available_count': aggregates['eval_available_count']
         }
+        return self._summary_cache
+    
+    def _game_columns(self) -> Dict[str, Any]:
+        """Return per-attribute columns of cece_games for scans that need one or two fields.
+        
+        The columns are cached until extract_cece_games runs again.
+        """
+        if self._columns is None:
+            games = self.cece_games
+            self._columns = {
+                'plycount': array('i', [g.plycount for g in games]),
+                'cece_color': [g.cece_color for g in games],
+                'cece_result': [g.cece_result for g in games]
+            }
+        return self._columns
+    
+    def _compute_aggregates(self) -> Dict[str, Any]:
+        """Tally everything the reports need from the games in one pass.
+        
+        Besides the summary counts this collects (opponent, result) and
+        (opening, result) counts, each game's bad-pattern count, and the games
+        bucketed by result and by having bad patterns, so the analyze_* and
+        find_* methods only reshape these tallies. They are cached until
+        extract_cece_games runs again.
+        """
+        if self._aggregates is None:
+            columns = self._game_columns()
+            outcomes = Counter(zip(columns['cece_color'], columns['cece_result']))
+            color_games = Counter(columns['cece_color'])
+            pattern_counts = Counter()
+            termination_counts = Counter()
+            opponent_results = Counter()
+            opening_results = Counter()
+            bad_pattern_counts = []
+            games_by_result = {'win': [], 'loss': [], 'draw': []}
+            bad_pattern_games = []
+            eval_available_count = 0
+            
+            for game in self.cece_games:
+                termination_counts[game.termination] += 1
+                opponent_results[game.opponent, game.cece_result] += 1
+                opening_results[game.opening, game.cece_result] += 1
+                bad_count = 0
+                for pattern_type, _ in game.key_patterns:
+                    pattern_counts[pattern_type] += 1
+                    if pattern_type in _BAD_PATTERN_TYPES:
+                        bad_count += 1
+                bad_pattern_counts.append(bad_count)
+                if bad_count:
+                    bad_pattern_games.append(game)
+                games_by_result.setdefault(game.cece_result, []).append(game)
+                if game.eval_available:
+                    eval_available_count += 1
+            
+            self._aggregates = {
+                'outcomes': outcomes,
+                'color_games': color_games,
+                'pattern_counts': pattern_counts,
+                'termination_counts': termination_counts,
+                'opponent_results': opponent_results,
+                'opening_results': opening_results,
+                'bad_pattern_counts': bad_pattern_counts,
+                'games_by_result': games_by_result,
+                'bad_pattern_games': bad_pattern_games,
+                'eval_available_count': eval_available_count
+            }
+        return self._aggregates
     
     def find_losses(self) -> List[GameResult]:
         """Find all games where Cece v1.3 lost."""
-        return [g for g in self.cece_games if g.cece_result == "loss"]
+        return self._compute_aggregates()['games_by_result']['loss']
     
     def find_games_with_bad_patterns(self) -> List[GameResult]:
         """Find games with concerning patterns."""
-        bad_patterns = ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT']
-        
-        bad_games = []
-        for game in self.cece_games:
-            for pattern in game.key_patterns:
-                if any(bad in pattern for bad in bad_patterns):
-                    bad_games.append(game)
-                    break
-        
-        return bad_games
+        return self._compute_aggregates()['bad_pattern_games']
     
     def export_to_json(self, output_path: str) -> Dict[str, Any]:
         """Export comprehensive tournament analysis to JSON."""
@@ -279,12 +486,11 @@ class TournamentAnalyzer:
         
         # Generate basic summary
         summary = self.generate_summary()
+        outcomes = self._compute_aggregates()['outcomes']
         
         # Extract detailed game data
-        games_data = []
-        for game in self.cece_games:
-            game_dict = asdict(game)
-            games_data.append(game_dict)
+        # Shallow copies are enough: GameResult has no nested dataclasses to recurse into
+        games_data = [{**game.__dict__} for game in self.cece_games]
         
         # Performance analysis by opponent
         opponent_analysis = self.analyze_by_opponent()
@@ -319,15 +525,15 @@ class TournamentAnalyzer:
                         "games": summary['white_games'],
                         "wins": summary['white_wins'],
                         "win_rate": summary['white_win_rate'],
-                        "losses": len([g for g in self.cece_games if g.cece_color == "white" and g.cece_result == "loss"]),
-                        "draws": len([g for g in self.cece_games if g.cece_color == "white" and g.cece_result == "draw"])
+                        "losses": outcomes['white', 'loss'],
+                        "draws": outcomes['white', 'draw']
                     },
                     "black": {
                         "games": summary['black_games'],
                         "wins": summary['black_wins'],
                         "win_rate": summary['black_win_rate'],
-                        "losses": len([g for g in self.cece_games if g.cece_color == "black" and g.cece_result == "loss"]),
-                        "draws": len([g for g in self.cece_games if g.cece_color == "black" and g.cece_result == "draw"])
+                        "losses": outcomes['black', 'loss'],
+                        "draws": outcomes['black', 'draw']
                     }
                 }
             },
@@ -343,53 +549,21 @@ class TournamentAnalyzer:
             "visualization_data": self.prepare_visualization_data()
         }
         
-        # Save to file
+        # Save to file, plus a small summary so the preview need not parse every game
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_data, f, indent=2, ensure_ascii=False)
+            _write_analysis_json(f, analysis_data)
+        with open(summary_json_path(output_path), 'w', encoding='utf-8') as f:
+            _write_analysis_json(f, {key: analysis_data[key] for key in _SUMMARY_SECTIONS})
         
         return analysis_data
     
     def analyze_by_opponent(self) -> Dict[str, Dict[str, Any]]:
         """Analyze performance against different opponents."""
-        opponent_stats = defaultdict(lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0, "win_rate": 0.0})
-        
-        for game in self.cece_games:
-            opponent = game.black if game.cece_color == "white" else game.white
-            opponent_stats[opponent]["games"] += 1
-            
-            if game.cece_result == "win":
-                opponent_stats[opponent]["wins"] += 1
-            elif game.cece_result == "loss":
-                opponent_stats[opponent]["losses"] += 1
-            else:
-                opponent_stats[opponent]["draws"] += 1
-        
-        # Calculate win rates
-        for opponent, stats in opponent_stats.items():
-            if stats["games"] > 0:
-                stats["win_rate"] = stats["wins"] / stats["games"]
-        
-        return dict(opponent_stats)
+        return self._tally_results(self._compute_aggregates()['opponent_results'])
     
     def analyze_openings(self) -> Dict[str, Any]:
         """Analyze opening performance."""
-        opening_stats = defaultdict(lambda: {"games": 0, "wins": 0, "losses": 0, "draws": 0, "win_rate": 0.0})
-        
-        for game in self.cece_games:
-            opening = game.opening
-            opening_stats[opening]["games"] += 1
-            
-            if game.cece_result == "win":
-                opening_stats[opening]["wins"] += 1
-            elif game.cece_result == "loss":
-                opening_stats[opening]["losses"] += 1
-            else:
-                opening_stats[opening]["draws"] += 1
-        
-        # Calculate win rates
-        for opening, stats in opening_stats.items():
-            if stats["games"] > 0:
-                stats["win_rate"] = stats["wins"] / stats["games"]
+        opening_stats = self._tally_results(self._compute_aggregates()['opening_results'])
         
         # Find best and worst openings
         openings_list = [(opening, stats) for opening, stats in opening_stats.items() if stats["games"] >= 2]
@@ -397,37 +571,57 @@ class TournamentAnalyzer:
         worst_openings = sorted(openings_list, key=lambda x: x[1]["win_rate"])[:3]
         
         return {
-            "opening_stats": dict(opening_stats),
+            "opening_stats": opening_stats,
             "best_openings": best_openings,
             "worst_openings": worst_openings,
             "most_played": sorted(opening_stats.items(), key=lambda x: x[1]["games"], reverse=True)[:5]
         }
     
+    @staticmethod
+    def _tally_results(counts: Counter) -> Dict[str, Dict[str, Any]]:
+        """Build games/wins/losses/draws/win_rate stats from (key, cece_result) counts."""
+        stats = {}
+        for (key, result), count in counts.items():
+            entry = stats.get(key)
+            if entry is None:
+                entry = stats[key] = {"games": 0, "wins": 0, "losses": 0, "draws": 0, "win_rate": 0.0}
+            entry["games"] += count
+            entry[_RESULT_FIELDS.get(result, "draws")] += count
+        
+        # Calculate win rates
+        for entry in stats.values():
+            entry["win_rate"] = entry["wins"] / entry["games"]
+        
+        return stats
+    
     def analyze_game_lengths(self) -> Dict[str, Any]:
         """Analyze game length patterns."""
-        lengths = [game.plycount for game in self.cece_games if game.plycount > 0]
+        columns = self._game_columns()
+        lengths = [length for length in columns['plycount'] if length > 0]
         
         if not lengths:
             return {"error": "No game length data available"}
         
-        # Categorize games by length
-        short_games = [l for l in lengths if l <= 30]
-        medium_games = [l for l in lengths if 30 < l <= 60]
-        long_games = [l for l in lengths if l > 60]
-        
-        # Analyze results by game length
-        short_results = [game.cece_result for game in self.cece_games if 0 < game.plycount <= 30]
-        medium_results = [game.cece_result for game in self.cece_games if 30 < game.plycount <= 60]
-        long_results = [game.cece_result for game in self.cece_games if game.plycount > 60]
+        # Categorize games by length and collect results for each category
+        short_results = []
+        medium_results = []
+        long_results = []
+        for length, result in zip(columns['plycount'], columns['cece_result']):
+            if length > 60:
+                long_results.append(result)
+            elif length > 30:
+                medium_results.append(result)
+            elif length > 0:
+                short_results.append(result)
         
         return {
             "average_length": sum(lengths) / len(lengths),
             "shortest_game": min(lengths),
             "longest_game": max(lengths),
             "length_distribution": {
-                "short_games": len(short_games),
-                "medium_games": len(medium_games),
-                "long_games": len(long_games)
+                "short_games": len(short_results),
+                "medium_games": len(medium_results),
+                "long_games": len(long_results)
             },
             "performance_by_length": {
                 "short": self._calculate_performance(short_results),
@@ -454,15 +648,16 @@ class TournamentAnalyzer:
     
     def analyze_pattern_trends(self) -> Dict[str, Any]:
         """Analyze how patterns change over the tournament."""
-        pattern_timeline = []
-        
-        for i, game in enumerate(self.cece_games):
-            pattern_timeline.append({
+        bad_pattern_counts = self._compute_aggregates()['bad_pattern_counts']
+        pattern_timeline = [
+            {
                 "game_number": i + 1,
                 "patterns": game.key_patterns,
                 "result": game.cece_result,
-                "bad_patterns": len([p for p in game.key_patterns if any(bad in p for bad in ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT'])])
-            })
+                "bad_patterns": bad_count
+            }
+            for i, (game, bad_count) in enumerate(zip(self.cece_games, bad_pattern_counts))
+        ]
         
         # Calculate trend in bad patterns
         early_games = pattern_timeline[:len(pattern_timeline)//3]
@@ -483,14 +678,13 @@ class TournamentAnalyzer:
     def find_concerning_patterns(self) -> List[Dict[str, Any]]:
         """Find games with the most concerning patterns."""
         concerning_games = []
+        bad_pattern_counts = self._compute_aggregates()['bad_pattern_counts']
         
-        for game in self.cece_games:
-            bad_pattern_count = len([p for p in game.key_patterns if any(bad in p for bad in ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT'])])
-            
+        for game, bad_pattern_count in zip(self.cece_games, bad_pattern_counts):
             if bad_pattern_count > 0:
                 concerning_games.append({
                     "game_number": game.game_number,
-                    "opponent": game.black if game.cece_color == "white" else game.white,
+                    "opponent": game.opponent,
                     "result": game.cece_result,
                     "bad_pattern_count": bad_pattern_count,
                     "patterns": game.key_patterns,
@@ -501,18 +695,19 @@ class TournamentAnalyzer:
     
     def identify_critical_games(self) -> Dict[str, List[Dict[str, Any]]]:
         """Identify critical games for analysis."""
-        losses = self.find_losses()
-        wins = [g for g in self.cece_games if g.cece_result == "win"]
+        games_by_result = self._compute_aggregates()['games_by_result']
+        losses = games_by_result['loss']
+        wins = games_by_result['win']
         concerning = self.find_games_with_bad_patterns()
         
         # Long draws (potential missed opportunities)
-        long_draws = [g for g in self.cece_games if g.cece_result == "draw" and g.plycount > 80]
+        long_draws = [g for g in games_by_result['draw'] if g.plycount > 80]
         
         return {
-            "losses": [asdict(game) for game in losses],
-            "wins": [asdict(game) for game in wins[:3]],  # Top 3 wins
-            "concerning_patterns": [asdict(game) for game in concerning[:3]],  # Top 3 concerning
-            "long_draws": [asdict(game) for game in long_draws[:3]]  # Top 3 long draws
+            "losses": [{**game.__dict__} for game in losses],
+            "wins": [{**game.__dict__} for game in wins[:3]],  # Top 3 wins
+            "concerning_patterns": [{**game.__dict__} for game in concerning[:3]],  # Top 3 concerning
+            "long_draws": [{**game.__dict__} for game in long_draws[:3]]  # Top 3 long draws
         }
     
     def generate_insights(self) -> List[Dict[str, str]]:
@@ -540,7 +735,7 @@ class TournamentAnalyzer:
             })
         
         # Pattern insights
-        bad_patterns = sum(count for pattern, count in summary['pattern_counts'].items() if pattern in ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT'])
+        bad_patterns = sum(count for pattern, count in summary['pattern_counts'].items() if pattern in _BAD_PATTERN_TYPES)
         if bad_patterns > 0:
             insights.append({
                 "type": "patterns",
@@ -562,31 +757,34 @@ class TournamentAnalyzer:
     
     def prepare_visualization_data(self) -> Dict[str, Any]:
         """Prepare data optimized for web visualization."""
+        aggregates = self._compute_aggregates()
+        outcomes = aggregates['outcomes']
+        color_games = aggregates['color_games']
         return {
             "performance_chart": {
                 "labels": ["Wins", "Losses", "Draws"],
                 "data": [
-                    sum(1 for g in self.cece_games if g.cece_result == "win"),
-                    sum(1 for g in self.cece_games if g.cece_result == "loss"),
-                    sum(1 for g in self.cece_games if g.cece_result == "draw")
+                    outcomes['white', 'win'] + outcomes['black', 'win'],
+                    outcomes['white', 'loss'] + outcomes['black', 'loss'],
+                    outcomes['white', 'draw'] + outcomes['black', 'draw']
                 ],
                 "colors": ["#4CAF50", "#F44336", "#FF9800"]
             },
             "color_performance": {
                 "white": {
-                    "wins": sum(1 for g in self.cece_games if g.cece_color == "white" and g.cece_result == "win"),
-                    "total": sum(1 for g in self.cece_games if g.cece_color == "white")
+                    "wins": outcomes['white', 'win'],
+                    "total": color_games['white']
                 },
                 "black": {
-                    "wins": sum(1 for g in self.cece_games if g.cece_color == "black" and g.cece_result == "win"),
-                    "total": sum(1 for g in self.cece_games if g.cece_color == "black")
+                    "wins": outcomes['black', 'win'],
+                    "total": color_games['black']
                 }
             },
             "game_timeline": [
                 {
                     "game": i + 1,
                     "result": game.cece_result,
-                    "opponent": game.black if game.cece_color == "white" else game.white,
+                    "opponent": game.opponent,
                     "length": game.plycount,
                     "patterns": len(game.key_patterns)
                 }
@@ -608,11 +806,11 @@ class TournamentAnalyzer:
         
         if game.key_patterns:
             print(f"   Patterns detected:")
-            for pattern in game.key_patterns:
-                if any(bad in pattern for bad in ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT']):
-                    print(f"     🚨 {pattern}")
+            for pattern_type, detail in game.key_patterns:
+                if pattern_type in _BAD_PATTERN_TYPES:
+                    print(f"     🚨 {format_pattern(pattern_type, detail)}")
                 else:
-                    print(f"     ℹ️  {pattern}")
+                    print(f"     ℹ️  {format_pattern(pattern_type, detail)}")
         
         if game.moves:
             # Show first 10 moves
@@ -647,7 +845,7 @@ def main():
     if summary['pattern_counts']:
         print(f"\\n🔍 PATTERN ANALYSIS")
         for pattern, count in summary['pattern_counts'].items():
-            emoji = "🚨" if pattern in ['BAD_OPENING', 'EARLY_QUEEN', 'RIM_KNIGHT'] else "ℹ️"
+            emoji = "🚨" if pattern in _BAD_PATTERN_TYPES else "ℹ️"
             print(f"  {emoji} {pattern}: {count}")
     
     if summary['termination_counts']:
@@ -10,6 +10,7 @@ License: GPL-3.0 (compatible with python-chess)
 Attribution: Built on python-chess library by Niklas Fiekas
 """
 
+import queue
 import sys
 import threading
 from typing import Optional, List
@@ -17,6 +18,25 @@ from engine import ChessEngine
 import chess
 
 
+# 'go' keyword -> (parameter name, value parser); each keyword takes one value
+_GO_PARSERS = {
+    "depth": ("depth", int),
+    "movetime": ("movetime", lambda v: float(v) / 1000.0),  # ms -> seconds
+    "wtime": ("wtime", int),
+    "btime": ("btime", int),
+    "winc": ("winc", int),
+    "binc": ("binc", int),
+}
+
+# Weight option -> (evaluation parameter, divisor from the UCI spin value)
+_WEIGHT_OPTIONS = {
+    "MaterialWeight": ("material", 100.0),
+    "PositionalWeight": ("positional", 100.0),
+    "TacticalWeight": ("tactical", 100.0),
+    "SafetyWeight": ("safety", 100.0),
+}
+
+
 class UCIInterface:
     """
     UCI protocol implementation for the hybrid chess engine.
@@ -29,13 +49,48 @@ class UCIInterface:
     """
     
     def __init__(self):
+        # GUIs read replies line by line: have the stream flush at each newline
+        # once, rather than forcing a flush on every send
+        reconfigure = getattr(sys.stdout, "reconfigure", None)
+        if reconfigure is not None:
+            reconfigure(line_buffering=True)
+        
         self.engine = ChessEngine()
         self.running = True
         self.debug = False
+        self._out_lock = threading.Lock()
+        
+        # The engine's progress lines share stdout with the replies, so they
+        # take the same lock
+        self.engine.output = self.send
+        
+        # Set by 'stop' (or 'quit'), polled by the search to bail out early
+        self.stop_event = threading.Event()
+        
+        # One long-lived search worker fed (depth, time_limit) jobs by 'go'
+        self.job_q: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker.start()
+        
+        # Command word -> handler, each taking the split command line
+        self._dispatch = {
+            "uci": lambda _parts: self.handle_uci(),
+            "isready": lambda _parts: self.handle_isready(),
+            "setoption": self.handle_setoption,
+            "ucinewgame": lambda _parts: self.handle_ucinewgame(),
+            "position": self.handle_position,
+            "go": self.handle_go,
+            "stop": lambda _parts: self.handle_stop(),
+            "quit": lambda _parts: self.handle_quit(),
+        }
         
     def send(self, message: str):
-        """Send a message to the GUI."""
-        print(message, flush=True)
+        """Send a message to the GUI as one whole line."""
+        # The search worker (including the engine's progress output) and the
+        # command loop both write; a single locked write keeps a bestmove and
+        # a readyok from splicing into each other
+        with self._out_lock:
+            sys.stdout.write(message + "\n")
         if self.debug:
             print(f">>> {message}", file=sys.stderr, flush=True)
     
@@ -80,27 +135,16 @@ class UCIInterface:
                     self.log(f"Hash size set to {value} MB")
                 elif name == "Threads":
                     self.log(f"Threads set to {value}")
-                elif name == "MaterialWeight":
-                    weight = float(value) / 100.0
-                    self.engine.tune_evaluation("material", weight)
-                    self.log(f"Material weight set to {weight}")
-                elif name == "PositionalWeight":
-                    weight = float(value) / 100.0
-                    self.engine.tune_evaluation("positional", weight)
-                    self.log(f"Positional weight set to {weight}")
-                elif name == "TacticalWeight":
-                    weight = float(value) / 100.0
-                    self.engine.tune_evaluation("tactical", weight)
-                    self.log(f"Tactical weight set to {weight}")
-                elif name == "SafetyWeight":
-                    weight = float(value) / 100.0
-                    self.engine.tune_evaluation("safety", weight)
-                    self.log(f"Safety weight set to {weight}")
+                elif name in _WEIGHT_OPTIONS:
+                    parameter, divisor = _WEIGHT_OPTIONS[name]
+                    weight = float(value) / divisor
+                    self.engine.tune_evaluation(parameter, weight)
+                    self.log(f"{parameter.capitalize()} weight set to {weight}")
     
     def handle_ucinewgame(self):
         """Handle the 'ucinewgame' command."""
-        # Reset the engine for a new game
-        self.engine = ChessEngine()
+        # Reset the engine for a new game, keeping its tables and options
+        self.engine.reset()
         self.log("New game started")
     
     def handle_position(self, parts: List[str]):
@@ -125,10 +169,8 @@ class UCIInterface:
         else:
             return
         
-        # Extract moves if present
-        moves = []
-        if moves_start < len(parts):
-            moves = parts[moves_start:]
+        # Moves follow the fixed-size position prefix (empty slice if none)
+        moves = parts[moves_start:]
         
         # Set position on engine
         self.engine.set_position(fen, moves)
@@ -136,58 +178,23 @@ class UCIInterface:
     
     def handle_go(self, parts: List[str]):
         """Handle the 'go' command - start searching."""
-        # Parse go command parameters
-        depth = None
-        movetime = None
-        wtime = None
-        btime = None
-        winc = None
-        binc = None
+        # Parse go command parameters in one pass over the tokens
+        params = {}
         infinite = False
-        
-        i = 1
-        while i < len(parts):
-            if parts[i] == "depth":
-                if i + 1 < len(parts):
-                    depth = int(parts[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "movetime":
-                if i + 1 < len(parts):
-                    movetime = float(parts[i + 1]) / 1000.0  # Convert ms to seconds
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "wtime":
-                if i + 1 < len(parts):
-                    wtime = int(parts[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "btime":
-                if i + 1 < len(parts):
-                    btime = int(parts[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "winc":
-                if i + 1 < len(parts):
-                    winc = int(parts[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "binc":
-                if i + 1 < len(parts):
-                    binc = int(parts[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            elif parts[i] == "infinite":
+        tokens = iter(parts[1:])
+        for token in tokens:
+            spec = _GO_PARSERS.get(token)
+            if spec is not None:
+                value = next(tokens, None)
+                if value is not None:
+                    params[spec[0]] = spec[1](value)
+            elif token == "infinite":
                 infinite = True
-                i += 1
-            else:
-                i += 1
+        
+        depth = params.get("depth")
+        movetime = params.get("movetime")
+        wtime = params.get("wtime")
+        btime = params.get("btime")
         
         # Determine search parameters
         search_depth = depth if depth is not None else self.engine.search_depth
@@ -201,17 +208,28 @@ class UCIInterface:
         
         self.log(f"Searching: depth={search_depth}, time={time_limit}s")
         
-        # Start search in a separate thread to allow for stop commands
-        search_thread = threading.Thread(
-            target=self._search_and_respond,
-            args=(search_depth, time_limit)
-        )
-        search_thread.start()
+        # A fresh search must not inherit a stop aimed at the previous one
+        self.stop_event.clear()
+        
+        # Hand the search to the worker so the loop stays free for 'stop'
+        self.job_q.put((search_depth, time_limit))
+    
+    def _worker_loop(self):
+        """Run queued searches one at a time until the None sentinel arrives."""
+        while True:
+            job = self.job_q.get()
+            try:
+                if job is None:
+                    return
+                self._search_and_respond(*job)
+            finally:
+                self.job_q.task_done()
     
     def _search_and_respond(self, depth: int, time_limit: float):
         """Perform the search and send the result."""
         try:
-            best_move = self.engine.get_best_move(depth, time_limit)
+            best_move = self.engine.get_best_move(depth, time_limit,
+                                                  self.stop_event.is_set)
             if best_move:
                 self.send(f"bestmove {best_move}")
             else:
@@ -222,23 +240,38 @@ class UCIInterface:
             self.send("bestmove 0000")
     
     def handle_stop(self):
-        """Handle the 'stop' command."""
-        # For now, we don't implement search interruption
-        # The search will complete and return normally
+        """Handle the 'stop' command - end the search and report its best move."""
         self.log("Stop command received")
+        self.stop_event.set()
+        # Queue.join() with a safety bound: sleep on the queue's own condition
+        # until the worker marks the search done, rather than polling for it.
+        # The search checks the event at every node, so this is normally quick.
+        with self.job_q.all_tasks_done:
+            self.job_q.all_tasks_done.wait_for(lambda: not self.job_q.unfinished_tasks,
+                                               timeout=5.0)
     
     def handle_quit(self):
         """Handle the 'quit' command."""
         self.running = False
+        self.stop_event.set()
         self.log("Quitting...")
     
+    def _unknown(self, parts: List[str]):
+        """Ignore commands this engine does not implement."""
+        self.log(f"Unknown command: {parts[0]}")
+    
     def run(self):
         """Main UCI loop."""
         self.log(f"Starting {self.engine.info['name']} UCI interface")
         
+        # Read raw lines straight from the stdin buffer instead of through input()
+        stdin = sys.stdin.buffer
         while self.running:
             try:
-                line = input().strip()
+                raw = stdin.readline()
+                if not raw:
+                    break  # EOF: the GUI closed the pipe
+                line = raw.decode('utf-8', 'replace').strip()
                 if not line:
                     continue
                 
@@ -248,31 +281,14 @@ class UCIInterface:
                 if not parts:
                     continue
                 
-                command = parts[0]
+                self._dispatch.get(parts[0], self._unknown)(parts)
                 
-                if command == "uci":
-                    self.handle_uci()
-                elif command == "isready":
-                    self.handle_isready()
-                elif command == "setoption":
-                    self.handle_setoption(parts)
-                elif command == "ucinewgame":
-                    self.handle_ucinewgame()
-                elif command == "position":
-                    self.handle_position(parts)
-                elif command == "go":
-                    self.handle_go(parts)
-                elif command == "stop":
-                    self.handle_stop()
-                elif command == "quit":
-                    self.handle_quit()
-                else:
-                    self.log(f"Unknown command: {command}")
-                    
-            except EOFError:
-                break
             except Exception as e:
                 self.log(f"Error processing command: {e}")
+        
+        # Let any queued search report its move, then retire the worker
+        self.job_q.put(None)
+        self.worker.join()
 
 
 def main():
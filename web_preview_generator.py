@@ -5,19 +5,131 @@ Generates HTML preview of the tournament data for visualization testing
 """
 
 import json
+import math
 import os
 from datetime import datetime
+from functools import lru_cache
 
-def generate_html_preview():
-    """Generate an HTML preview of the tournament analysis data."""
+from tournament_analysis import summary_json_path
+
+try:
+    import orjson  # Optional: much faster loads/dumps for large analysis files
+except ImportError:
+    orjson = None
+
+
+def _json_loads(raw: bytes):
+    """Parse a JSON document with orjson when installed, else the stdlib."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+# Characters that could end the <script> block or open markup inside a string
+_SCRIPT_UNSAFE = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026'})
+
+
+def _finite(value):
+    """Copy of value with NaN and infinite floats replaced by None, as orjson writes them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _json_dumps(value) -> str:
+    """
+    Compact JSON text that is safe inside <script>.
+    
+    Both backends write NaN and infinities as null (the stdlib would otherwise
+    emit NaN/Infinity, which is not JSON); the stdlib only pays for the
+    normalising copy when such a value is actually present.
+    """
+    if orjson is not None:
+        text = orjson.dumps(value).decode('utf-8')
+    else:
+        try:
+            text = json.dumps(value, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+        except ValueError:
+            text = json.dumps(_finite(value), ensure_ascii=False, separators=(',', ':'))
+    return text.translate(_SCRIPT_UNSAFE)
+
+
+_OPENING_ROW = """
+                    <tr>
+                        <td>{0}</td>
+                        <td>{1}</td>
+                        <td>{2}</td>
+                        <td>{3}</td>
+                        <td>{4}</td>
+                        <td class="{6}">{5:.1%}</td>
+                    </tr>
+"""
+
+
+def _render_opening_rows(opening_data) -> str:
+    """Table rows for the opening heatmap, best win rate first; repeat data renders once."""
+    rows = tuple((opening, stats['games'], stats['wins'], stats['draws'], stats['losses'], stats['win_rate'])
+                 for opening, stats in opening_data.items())
+    return _opening_rows_html(rows)
+
+
+@lru_cache(maxsize=8)
+def _opening_rows_html(rows) -> str:
+    """Sort and format (opening, games, wins, draws, losses, win_rate) rows into HTML."""
+    return "".join(
+        _OPENING_ROW.format(*row, 'win-rate-good' if row[5] >= 0.5 else 'win-rate-bad' if row[5] < 0.3 else 'win-rate-average')
+        for row in sorted(rows, key=lambda row: row[5], reverse=True)
+    )
+
+
+def generate_html_preview(output_path=None):
+    """Generate an HTML preview of the tournament analysis data, written to output_path."""
     
     # Load the analysis data
     json_file = r"s:\Maker Stuff\Programming\Static Evaluation Chess Engine\static_evaluation_engine\results\historical\tournament_analysis_results_20250807_1500.json"
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # The analyzer writes the sections the page needs to a small side file;
+    # fall back to the full report for files exported before it did
+    summary_file = summary_json_path(json_file)
+    if os.path.exists(summary_file):
+        json_file = summary_file
+    
+    with open(json_file, 'rb') as f:
+        data = _json_loads(f.read())
+    
+    if output_path is None:
+        output_path = r"s:\Maker Stuff\Programming\Static Evaluation Chess Engine\static_evaluation_engine\results\historical\tournament_analysis_preview_20250807_1500.html"
+    
+    # Write each fragment as it is rendered so the whole page is never held in
+    # memory; it goes to a side file first, so a report missing a section
+    # fails without clobbering the previous good preview
+    temp_path = output_path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.writelines(_render_preview(data))
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    return output_path
+
+
+def _render_preview(data):
+    """Yield the preview page for the analysis data one HTML fragment at a time."""
+    summary = data['tournament_summary']
+    
+    # Everything the charts plot, serialised once into a single script constant
+    chart_payload = {
+        "wdl": [summary['wins'], summary['losses'], summary['draws']],
+        "colors": [round(summary['white_win_rate'], 3), round(summary['black_win_rate'], 3)],
+        "timeline": data['visualization_data']['game_timeline'],
+    }
     
-    html_content = f"""
+    yield f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -158,7 +270,7 @@ def generate_html_preview():
     for insight in data['insights_and_recommendations']:
         severity_class = f"severity-{insight['severity']}"
         severity_emoji = "🚨" if insight['severity'] == 'high' else "⚠️" if insight['severity'] == 'medium' else "ℹ️"
-        html_content += f"""
+        yield f"""
             <div class="insight {severity_class}">
                 <strong>{severity_emoji} {insight['title']}</strong><br>
                 {insight['description']}
@@ -166,7 +278,7 @@ def generate_html_preview():
 """
     
     # Add opening analysis table
-    html_content += f"""
+    yield """
         </div>
 
         <div class="chart-container">
@@ -186,29 +298,17 @@ def generate_html_preview():
 """
     
     # Add opening data
-    opening_data = data['visualization_data']['opening_heatmap']
-    for opening, stats in sorted(opening_data.items(), key=lambda x: x[1]['win_rate'], reverse=True):
-        win_rate = stats['win_rate']
-        win_rate_class = 'win-rate-good' if win_rate >= 0.5 else 'win-rate-bad' if win_rate < 0.3 else 'win-rate-average'
-        
-        html_content += f"""
-                    <tr>
-                        <td>{opening}</td>
-                        <td>{stats['games']}</td>
-                        <td>{stats['wins']}</td>
-                        <td>{stats['draws']}</td>
-                        <td>{stats['losses']}</td>
-                        <td class="{win_rate_class}">{win_rate:.1%}</td>
-                    </tr>
-"""
+    yield _render_opening_rows(data['visualization_data']['opening_heatmap'])
     
-    html_content += """
+    yield """
                 </tbody>
             </table>
         </div>
     </div>
 
     <script>
+        const CECE_DATA = """ + _json_dumps(chart_payload) + """;
+
         // Performance Overview Chart
         const performanceCtx = document.getElementById('performanceChart').getContext('2d');
         const performanceChart = new Chart(performanceCtx, {
@@ -216,7 +316,7 @@ def generate_html_preview():
             data: {
                 labels: ['Wins', 'Losses', 'Draws'],
                 datasets: [{
-                    data: """ + str([data['tournament_summary']['wins'], data['tournament_summary']['losses'], data['tournament_summary']['draws']]) + """,
+                    data: CECE_DATA.wdl,
                     backgroundColor: ['#4CAF50', '#F44336', '#FF9800'],
                     borderWidth: 2
                 }]
@@ -239,7 +339,7 @@ def generate_html_preview():
                 labels: ['White', 'Black'],
                 datasets: [{
                     label: 'Win Rate',
-                    data: [""" + f"{data['tournament_summary']['white_win_rate']:.3f}, {data['tournament_summary']['black_win_rate']:.3f}" + """],
+                    data: CECE_DATA.colors,
                     backgroundColor: ['#007bff', '#6c757d'],
                     borderWidth: 1
                 }]
@@ -267,7 +367,7 @@ def generate_html_preview():
 
         // Timeline Chart
         const timelineCtx = document.getElementById('timelineChart').getContext('2d');
-        const timelineData = """ + json.dumps(data['visualization_data']['game_timeline']) + """;
+        const timelineData = CECE_DATA.timeline;
         
         const timelineChart = new Chart(timelineCtx, {
             type: 'line',
@@ -313,14 +413,6 @@ def generate_html_preview():
 </body>
 </html>
 """
-    
-    # Save the HTML file
-    output_path = r"s:\Maker Stuff\Programming\Static Evaluation Chess Engine\static_evaluation_engine\results\historical\tournament_analysis_preview_20250807_1500.html"
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    return output_path
 
 if __name__ == "__main__":
     html_file = generate_html_preview()